@@ -2,6 +2,7 @@
 Main application for Azure Speech Recognition.
 Combines all tabs and components and launches the Gradio interface.
 """
+import asyncio
 import gradio as gr
 import logging
 import argparse
@@ -18,6 +19,7 @@ from config import (
     AZURE_OPENAI_ENDPOINT,
     AZURE_OPENAI_DEPLOYMENT_ID,
 )
+from utils import get_confidence_css
 
 from tabs.microphone_tab import create_microphone_tab
 from tabs.file_tab import create_file_tab
@@ -35,6 +37,24 @@ def toggle_debug_mode(enable_debug):
     return f"Current logging level: {logging.getLevelName(level)}"
 
 
+def install_uvloop():
+    """
+    Use uvloop for the asyncio event loops serving the app, when installed
+
+    Returns:
+        bool: True if uvloop is in use, False if the default loop is kept
+    """
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+    return True
+
+
 def create_app():
     """
     Create and configure the Gradio app
@@ -42,8 +62,8 @@ def create_app():
     Returns:
         gr.Blocks: Configured Gradio application
     """
-    # Create Gradio interface
-    with gr.Blocks(title="Azure Speech Recognition") as demo:
+    # Create Gradio interface; shared styles are sent once with the page
+    with gr.Blocks(title="Azure Speech Recognition", css=get_confidence_css()) as demo:
         gr.Markdown("# Azure Speech Recognition")
 
         with gr.Tabs():
@@ -97,6 +117,9 @@ def main():
         # Set logging level based on command-line argument
         set_logging_level(debug_mode=args.debug)
 
+        # Must happen before Gradio creates its event loop
+        install_uvloop()
+
         # Verify configurations
         configs = verify_configs()
 
@@ -37,6 +37,19 @@ AZURE_OPENAI_GPT4O_DEPLOYMENT_ID = os.getenv("AZURE_OPENAI_GPT4O_DEPLOYMENT_ID")
 # Direct OpenAI API configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# UI refresh interval (milliseconds) while recognition results are changing
+SPEECH_UI_POLL_MS = int(os.getenv("SPEECH_UI_POLL_MS", "100"))
+
+# Maximum number of audio files recognized concurrently (bounded by the Speech resource quota)
+SPEECH_MAX_FILE_JOBS = int(os.getenv("SPEECH_MAX_FILE_JOBS", "4"))
+
+# SQLite file persisting GPT-4o file transcriptions across restarts; disabled
+# unless set, since it keeps transcripts of user audio on disk
+GPT4O_CACHE_DB = os.getenv("GPT4O_CACHE_DB", "")
+# Limits on the persistent cache: most transcriptions kept, and days each is kept
+GPT4O_CACHE_MAX_ROWS = int(os.getenv("GPT4O_CACHE_MAX_ROWS", "200"))
+GPT4O_CACHE_MAX_AGE_DAYS = float(os.getenv("GPT4O_CACHE_MAX_AGE_DAYS", "7"))
+
 
 # Create Azure Speech config
 def create_speech_config():
@@ -3,13 +3,38 @@ GPT-4o File Transcription service for Azure Speech Recognition.
 Implements calls to Azure OpenAI GPT-4o-transcribe model for file-based transcription.
 """
 import time
+import asyncio
+import hashlib
+import html
 import logging
-from typing import Tuple, Optional, Dict, Any
+import sqlite3
+import threading
+import zlib
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Tuple, Optional, Dict, Any, AsyncGenerator, List
 import os
 
-from openai import AzureOpenAI
-from config import set_logging_level
-from utils import get_audio_length, format_processing_info, process_transcription_with_confidence
+# soundfile (and numpy with it) is imported only when a file is split, so
+# loading the app doesn't pay for it
+if TYPE_CHECKING:
+    import soundfile as sf
+
+from openai import AsyncAzureOpenAI
+from config import (
+    set_logging_level,
+    GPT4O_CACHE_DB,
+    GPT4O_CACHE_MAX_ROWS,
+    GPT4O_CACHE_MAX_AGE_DAYS,
+)
+from utils import (
+    get_audio_length,
+    format_processing_info,
+    process_transcription_with_confidence,
+    format_confidence_spans,
+    wrap_confidence_html,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,64 +43,548 @@ AZURE_OPENAI_GPT4O_API_KEY = os.getenv("AZURE_OPENAI_GPT4O_API_KEY")
 AZURE_OPENAI_GPT4O_ENDPOINT = os.getenv("AZURE_OPENAI_GPT4O_ENDPOINT")
 AZURE_OPENAI_GPT4O_DEPLOYMENT_ID = os.getenv("AZURE_OPENAI_GPT4O_DEPLOYMENT_ID")
 
+# Completed transcriptions, keyed by audio content and transcription options
+TRANSCRIPTION_CACHE_SIZE = 32
+# Audio files are hashed in blocks of this size, so large files are never
+# read into memory whole
+HASH_BLOCK_SIZE = 1024 * 1024
+_transcription_cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+# Cache lookups and stores run in worker threads
+_transcription_cache_lock = threading.Lock()
+
+# Files over the service's upload limit are cut at the quietest point near
+# every CHUNK_TARGET_SECONDS (shorter if needed to keep each chunk under
+# CHUNK_MAX_BYTES) and the chunks are transcribed in parallel, at most
+# MAX_PARALLEL_CHUNKS at a time
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+CHUNK_MAX_BYTES = 24_000_000
+CHUNK_TARGET_SECONDS = 300
+CHUNK_SEARCH_SECONDS = 10
+CHUNK_FRAME_SECONDS = 0.03
+MAX_PARALLEL_CHUNKS = 8
+
+# Persistent copy of the cache in SQLite, opened on first use (opt-in, see
+# GPT4O_CACHE_DB); rows expire after GPT4O_CACHE_MAX_AGE_DAYS
+_cache_db: Optional[sqlite3.Connection] = None
+_cache_db_lock = threading.Lock()
+
+
+def _transcription_cache_key(
+    file_path: str, prompt: str, include_logprobs: bool, visualization_format: str
+) -> str:
+    """
+    Build a cache key from the audio content and the transcription options
+
+    The whole file is hashed: recordings that share a header, intro and outro
+    must not share a transcript. This reads the file, so call it off the event
+    loop.
+
+    Args:
+        file_path (str): Path to the audio file
+        prompt (str): Prompt used to guide transcription
+        include_logprobs (bool): Whether confidence scores are included
+        visualization_format (str): How confidence scores are visualized
+
+    Returns:
+        str: Cache key
+    """
+    size = 0
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+            size += len(block)
+    return "|".join(
+        [
+            digest.hexdigest(),
+            str(size),
+            AZURE_OPENAI_GPT4O_DEPLOYMENT_ID or "",
+            prompt or "",
+            str(include_logprobs),
+            visualization_format if include_logprobs else "",
+        ]
+    )
+
+
+def _get_cache_db() -> Optional[sqlite3.Connection]:
+    """
+    Open the persistent transcription cache, creating its table if needed
+
+    Returns:
+        Optional[sqlite3.Connection]: Connection, or None if persistence is disabled
+    """
+    global _cache_db
+    if _cache_db is None and GPT4O_CACHE_DB:
+        _cache_db = sqlite3.connect(GPT4O_CACHE_DB, check_same_thread=False)
+        _cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS transcriptions "
+            "(key TEXT PRIMARY KEY, status TEXT, result BLOB, created REAL)"
+        )
+        try:
+            # Caches written before rows had a creation time; they expire at once
+            _cache_db.execute(
+                "ALTER TABLE transcriptions ADD COLUMN created REAL DEFAULT 0"
+            )
+        except sqlite3.OperationalError:
+            pass
+        _prune_cache_db(_cache_db)
+    return _cache_db
+
+
+def _cache_cutoff() -> float:
+    """
+    Get the creation time before which persisted transcriptions are expired
+
+    Returns:
+        float: Unix timestamp
+    """
+    return time.time() - GPT4O_CACHE_MAX_AGE_DAYS * 24 * 60 * 60
+
+
+def _prune_cache_db(db: sqlite3.Connection) -> None:
+    """
+    Delete expired transcriptions and all but the newest GPT4O_CACHE_MAX_ROWS
+
+    Args:
+        db (sqlite3.Connection): Persistent cache connection
+    """
+    db.execute("DELETE FROM transcriptions WHERE created < ?", (_cache_cutoff(),))
+    db.execute(
+        "DELETE FROM transcriptions WHERE key NOT IN "
+        "(SELECT key FROM transcriptions ORDER BY created DESC LIMIT ?)",
+        (GPT4O_CACHE_MAX_ROWS,),
+    )
+    db.commit()
+
+
+def _load_cached_transcription(cache_key: str) -> Optional[Tuple[str, str]]:
+    """
+    Look up a transcription in memory first, then in the persistent cache
+
+    This may query SQLite, so call it off the event loop.
+
+    Args:
+        cache_key (str): Key from _transcription_cache_key
+
+    Returns:
+        Optional[Tuple[str, str]]: Status message and result, or None on a miss
+    """
+    with _transcription_cache_lock:
+        cached = _transcription_cache.get(cache_key)
+        if cached is not None:
+            _transcription_cache.move_to_end(cache_key)
+            return cached
+
+    try:
+        with _cache_db_lock:
+            db = _get_cache_db()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT status, result FROM transcriptions "
+                "WHERE key = ? AND created >= ?",
+                (cache_key, _cache_cutoff()),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not read GPT-4o transcription cache: {e}")
+        return None
+    if row is None:
+        return None
+
+    # Results are stored compressed; span-per-word HTML compresses very well
+    cached = (row[0], zlib.decompress(row[1]).decode("utf-8"))
+    _remember_transcription(cache_key, cached)
+    return cached
+
+
+def _remember_transcription(cache_key: str, entry: Tuple[str, str]) -> None:
+    """
+    Store a transcription in the in-memory cache, evicting the oldest entry
+
+    Args:
+        cache_key (str): Key from _transcription_cache_key
+        entry (Tuple[str, str]): Status message and result
+    """
+    with _transcription_cache_lock:
+        _transcription_cache[cache_key] = entry
+        if len(_transcription_cache) > TRANSCRIPTION_CACHE_SIZE:
+            _transcription_cache.popitem(last=False)
+
+
+def _store_transcription(cache_key: str, status: str, result: str) -> None:
+    """
+    Store a completed transcription in memory and in the persistent cache
+
+    This may write to SQLite, so call it off the event loop.
+
+    Args:
+        cache_key (str): Key from _transcription_cache_key
+        status (str): Final status message
+        result (str): Transcription result
+    """
+    _remember_transcription(cache_key, (status, result))
+
+    try:
+        with _cache_db_lock:
+            db = _get_cache_db()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO transcriptions (key, status, result, created) "
+                "VALUES (?, ?, ?, ?)",
+                (cache_key, status, zlib.compress(result.encode("utf-8")), time.time()),
+            )
+            _prune_cache_db(db)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not write GPT-4o transcription cache: {e}")
+
+
+def _find_quiet_point(audio_file: "sf.SoundFile", center: int) -> int:
+    """
+    Find the quietest frame within CHUNK_SEARCH_SECONDS of a sample position
+
+    Args:
+        audio_file (sf.SoundFile): Open audio file
+        center (int): Sample position to search around
+
+    Returns:
+        int: Sample position at the start of the quietest frame
+    """
+    rate = audio_file.samplerate
+    frame = max(1, int(rate * CHUNK_FRAME_SECONDS))
+    search = int(rate * CHUNK_SEARCH_SECONDS)
+    start = max(0, center - search)
+
+    # Only the search window is read, never the whole file
+    audio_file.seek(start)
+    window = audio_file.read(2 * search, dtype="float32", always_2d=True)
+    n_frames = len(window) // frame
+    if n_frames == 0:
+        return center
+
+    frames = window[: n_frames * frame].reshape(n_frames, frame, -1)
+    energy = (frames * frames).mean(axis=(1, 2))
+    return start + int(energy.argmin()) * frame
+
+
+def _split_on_silence(file_path: str, out_dir: str) -> List[str]:
+    """
+    Split an audio file too large to upload into mono WAV chunks cut at quiet points
+
+    Args:
+        file_path (str): Path to the audio file
+        out_dir (str): Directory to write the chunks to
+
+    Returns:
+        List[str]: Chunk paths in order, or an empty list if the file is small
+            enough to send whole or cannot be read
+    """
+    if os.path.getsize(file_path) <= MAX_UPLOAD_BYTES:
+        return []
+
+    import soundfile as sf
+
+    try:
+        with sf.SoundFile(file_path) as audio_file:
+            rate = audio_file.samplerate
+            total = audio_file.frames
+
+            # Chunks are written as 16-bit mono; the last one can run to 1.5
+            # targets plus a search window either side, and must still fit
+            max_seconds = CHUNK_MAX_BYTES / (rate * 2)
+            target_seconds = min(
+                CHUNK_TARGET_SECONDS, (max_seconds - 2 * CHUNK_SEARCH_SECONDS) / 1.5
+            )
+            target = int(rate * target_seconds)
+
+            # The last cut leaves at least half a chunk after it
+            cuts = [0]
+            for mark in range(target, total - target // 2, target):
+                cuts.append(_find_quiet_point(audio_file, mark))
+            cuts.append(total)
+
+            chunk_paths = []
+            for index, (start, stop) in enumerate(zip(cuts, cuts[1:])):
+                audio_file.seek(start)
+                data = audio_file.read(stop - start, dtype="float32", always_2d=True)
+                chunk_path = os.path.join(out_dir, f"chunk_{index:03d}.wav")
+                # Downmix to mono: stereo at the source rate would not fit
+                sf.write(chunk_path, data.mean(axis=1), rate, subtype="PCM_16")
+                chunk_paths.append(chunk_path)
+    except RuntimeError as e:
+        logger.warning(f"Could not split audio file, sending it whole: {e}")
+        return []
+
+    logger.info(f"Split audio file into {len(chunk_paths)} chunks")
+    return chunk_paths
+
+
+def _render_chunk_results(
+    results: List[Any], include_logprobs: bool, visualization_format: str
+) -> str:
+    """
+    Stitch the transcriptions of consecutive chunks into one result
+
+    Args:
+        results (List[Any]): Transcription results, in chunk order
+        include_logprobs (bool): Whether the results carry confidence scores
+        visualization_format (str): How to visualize confidence scores (html, markdown, text)
+
+    Returns:
+        str: Transcription result
+    """
+    if not include_logprobs:
+        return " ".join(str(result).strip() for result in results)
+
+    if visualization_format == "html":
+        return wrap_confidence_html(
+            " ".join(
+                format_confidence_spans(result.text, result.logprobs or [])
+                for result in results
+            )
+        )
+
+    logprobs = []
+    for result in results:
+        logprobs.extend(result.logprobs or [])
+    return process_transcription_with_confidence(
+        {"text": " ".join(result.text for result in results), "logprobs": logprobs},
+        format_type=visualization_format,
+    )
+
 
-def process_gpt4o_file_transcription(
-    file_path: str, 
-    prompt: str = "", 
-    response_format: str = "text",
+async def _transcribe_chunk(
+    client: AsyncAzureOpenAI,
+    chunk_path: str,
+    prompt: str,
+    include_logprobs: bool,
+    semaphore: asyncio.Semaphore,
+) -> Any:
+    """
+    Transcribe a single chunk, waiting for a free slot first
+
+    Args:
+        client (AsyncAzureOpenAI): Client for Azure OpenAI GPT-4o
+        chunk_path (str): Path to the chunk
+        prompt (str): Optional prompt to guide transcription
+        include_logprobs (bool): Whether to include confidence scores
+        semaphore (asyncio.Semaphore): Limits the number of parallel requests
+
+    Returns:
+        Any: Transcription result
+    """
+    async with semaphore:
+        with open(chunk_path, "rb") as audio_file:
+            params = {
+                "model": AZURE_OPENAI_GPT4O_DEPLOYMENT_ID,
+                "file": audio_file,
+                "response_format": "json" if include_logprobs else "text",
+            }
+            if prompt:
+                params["prompt"] = prompt
+            if include_logprobs:
+                params["include"] = ["logprobs"]
+            return await client.audio.transcriptions.create(**params)
+
+
+async def _stream_chunked_transcription(
+    client: AsyncAzureOpenAI,
+    chunk_paths: List[str],
+    prompt: str,
+    include_logprobs: bool,
+    visualization_format: str,
+) -> AsyncGenerator[Tuple[Optional[str], str], None]:
+    """
+    Transcribe chunks in parallel, yielding the transcript of every finished
+    leading run of chunks
+
+    Args:
+        client (AsyncAzureOpenAI): Client for Azure OpenAI GPT-4o
+        chunk_paths (List[str]): Chunk paths, in order
+        prompt (str): Optional prompt to guide transcription
+        include_logprobs (bool): Whether to include confidence scores
+        visualization_format (str): How to visualize confidence scores (html, markdown, text)
+
+    Yields:
+        Tuple[Optional[str], str]: Progress status and transcription so far; the
+            status is None for the final result
+    """
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_CHUNKS)
+    tasks = [
+        asyncio.create_task(
+            _transcribe_chunk(client, chunk_path, prompt, include_logprobs, semaphore)
+        )
+        for chunk_path in chunk_paths
+    ]
+    try:
+        shown = 0
+        for finished in asyncio.as_completed(tasks):
+            await finished
+            # Only show chunks once every chunk before them is done
+            ready = shown
+            while ready < len(tasks) and tasks[ready].done():
+                ready += 1
+            if ready == shown or ready == len(tasks):
+                continue
+            shown = ready
+            partial = _render_chunk_results(
+                [task.result() for task in tasks[:shown]],
+                include_logprobs,
+                visualization_format,
+            )
+            yield f"Status: 📝 GPT-4o Transcribing... ({shown}/{len(tasks)} chunks)", partial
+
+        yield None, _render_chunk_results(
+            [task.result() for task in tasks], include_logprobs, visualization_format
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _stream_whole_file(
+    client: AsyncAzureOpenAI,
+    file_path: str,
+    prompt: str,
+    include_logprobs: bool,
+    visualization_format: str,
+) -> AsyncGenerator[Tuple[Optional[str], str], None]:
+    """
+    Transcribe a file in a single streaming request
+
+    Args:
+        client (AsyncAzureOpenAI): Client for Azure OpenAI GPT-4o
+        file_path (str): Path to the audio file
+        prompt (str): Optional prompt to guide transcription
+        include_logprobs (bool): Whether to include confidence scores
+        visualization_format (str): How to visualize confidence scores (html, markdown, text)
+
+    Yields:
+        Tuple[Optional[str], str]: Progress status and transcription so far; the
+            status is None for the final result
+    """
+    # Confidence spans are rendered per delta and concatenated, so the
+    # HTML view never re-renders the whole transcript
+    render_spans = include_logprobs and visualization_format == "html"
+    text_parts = []
+    span_parts = []
+    done_event = None
+
+    with open(file_path, "rb") as audio_file:
+        params = {
+            "model": AZURE_OPENAI_GPT4O_DEPLOYMENT_ID,
+            "file": audio_file,
+            "response_format": "json" if include_logprobs else "text",
+            "stream": True,
+        }
+        if prompt:
+            params["prompt"] = prompt
+        if include_logprobs:
+            params["include"] = ["logprobs"]
+
+        logger.debug("Sending streaming request to Azure OpenAI GPT-4o-transcribe API")
+        stream = await client.audio.transcriptions.create(**params)
+
+        async for event in stream:
+            if event.type == "transcript.text.delta":
+                text_parts.append(event.delta)
+                if render_spans:
+                    # A delta without logprobs is still part of the transcript
+                    if event.logprobs:
+                        span_parts.append(format_confidence_spans(event.delta, event.logprobs))
+                    else:
+                        span_parts.append(html.escape(event.delta))
+                    partial = wrap_confidence_html("".join(span_parts))
+                else:
+                    partial = "".join(text_parts)
+                yield "Status: 📝 GPT-4o Transcribing...", partial
+            elif event.type == "transcript.text.done":
+                done_event = event
+
+    if render_spans and span_parts:
+        result = wrap_confidence_html("".join(span_parts))
+    elif include_logprobs and done_event is not None:
+        result = process_transcription_with_confidence(
+            done_event, format_type=visualization_format
+        )
+    else:
+        result = done_event.text if done_event is not None else "".join(text_parts)
+    yield None, result
+
+
+async def stream_gpt4o_file_transcription(
+    file_path: str,
+    prompt: str = "",
     include_logprobs: bool = False,
     visualization_format: str = "html"
-) -> Tuple[str, str]:
+) -> AsyncGenerator[Tuple[str, str], None]:
     """
-    Process audio file using Azure OpenAI GPT-4o-transcribe model
+    Stream transcription of an audio file from Azure OpenAI GPT-4o-transcribe,
+    yielding the partial transcript as it is generated
+
+    Files over the upload limit are split at quiet points and their chunks
+    transcribed in parallel; the transcript then grows a chunk at a time.
 
     Args:
         file_path (str): Path to the audio file
         prompt (str): Optional prompt to guide transcription
-        response_format (str): Format of the response (text or json)
         include_logprobs (bool): Whether to include confidence scores
         visualization_format (str): How to visualize confidence scores (html, markdown, text)
 
-    Returns:
-        Tuple[str, str]: Status message and transcription result
+    Yields:
+        Tuple[str, str]: Status message and transcription result so far
     """
     if not file_path:
-        return "Status: ❌ No file uploaded", ""
-    
+        yield "Status: ❌ No file uploaded", ""
+        return
+
     if not all([AZURE_OPENAI_GPT4O_API_KEY, AZURE_OPENAI_GPT4O_ENDPOINT, AZURE_OPENAI_GPT4O_DEPLOYMENT_ID]):
-        return "Status: ❌ Missing GPT-4o API configuration", "Please set AZURE_OPENAI_GPT4O_API_KEY, AZURE_OPENAI_GPT4O_ENDPOINT, and AZURE_OPENAI_GPT4O_DEPLOYMENT_ID in your .env file."
+        yield "Status: ❌ Missing GPT-4o API configuration", "Please set AZURE_OPENAI_GPT4O_API_KEY, AZURE_OPENAI_GPT4O_ENDPOINT, and AZURE_OPENAI_GPT4O_DEPLOYMENT_ID in your .env file."
+        return
 
+    chunk_dir = None
     try:
+        # Return the stored result if this audio was already transcribed this way
+        cache_key = await asyncio.to_thread(
+            _transcription_cache_key,
+            file_path,
+            prompt,
+            include_logprobs,
+            visualization_format,
+        )
+        cached = await asyncio.to_thread(_load_cached_transcription, cache_key)
+        if cached is not None:
+            logger.info("Returning cached GPT-4o transcription")
+            yield cached
+            return
+
         # Get audio file length
         audio_length = get_audio_length(file_path)
 
         # Record start time
         start_time = time.time()
 
-        # Create client for Azure OpenAI GPT-4o
-        client = AzureOpenAI(
+        client = AsyncAzureOpenAI(
             api_key=AZURE_OPENAI_GPT4O_API_KEY,
-            api_version="2025-03-01-preview",  # Make sure to use the correct API version
+            api_version="2025-03-01-preview",
             azure_endpoint=f"https://{AZURE_OPENAI_GPT4O_ENDPOINT.split('/openai/deployments')[0]}"
         )
 
-        # Prepare parameters for the API call
-        params = {
-            "model": AZURE_OPENAI_GPT4O_DEPLOYMENT_ID,
-            "file": open(file_path, "rb"),
-            "response_format": "json" if include_logprobs else response_format
-        }
-        
-        # Add optional parameters if provided
-        if prompt:
-            params["prompt"] = prompt
-            
-        # Add logprobs if requested
-        if include_logprobs:
-            params["include"] = ["logprobs"]
+        chunk_dir = tempfile.mkdtemp(prefix="gpt4o_chunks_")
+        chunk_paths = await asyncio.to_thread(_split_on_silence, file_path, chunk_dir)
+        if chunk_paths:
+            updates = _stream_chunked_transcription(
+                client, chunk_paths, prompt, include_logprobs, visualization_format
+            )
+        else:
+            updates = _stream_whole_file(
+                client, file_path, prompt, include_logprobs, visualization_format
+            )
 
-        logger.debug("Sending request to Azure OpenAI GPT-4o-transcribe API")
-        result = client.audio.transcriptions.create(**params)
+        result = ""
+        async for progress, result in updates:
+            if progress is not None:
+                yield progress, result
 
         # Calculate processing time
         processing_time = time.time() - start_time
@@ -84,21 +593,14 @@ def process_gpt4o_file_transcription(
         status = format_processing_info(
             audio_length, processing_time, "Status: ✅ GPT-4o Transcription complete"
         )
-        
-        # Process the result based on whether we requested confidence scores
-        if include_logprobs:
-            # Process the result with our confidence visualization
-            formatted_result = process_transcription_with_confidence(
-                result, format_type=visualization_format
-            )
-            return status, formatted_result
-        else:
-            # Return the text or full result based on format
-            if response_format == "json":
-                return status, str(result)
-            else:
-                return status, result
+
+        await asyncio.to_thread(_store_transcription, cache_key, status, str(result))
+
+        yield status, result
 
     except Exception as e:
         logger.error(f"Error during GPT-4o transcription: {e}")
-        return "Status: ❌ GPT-4o Transcription error", str(e)
\ No newline at end of file
+        yield "Status: ❌ GPT-4o Transcription error", str(e)
+    finally:
+        if chunk_dir is not None:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
@@ -2,44 +2,102 @@
 Core Azure Speech Recognition service implementation.
 Handles continuous speech recognition from microphone and audio files.
 """
+import asyncio
 import logging
 import threading
+import uuid
 import azure.cognitiveservices.speech as speechsdk
-from typing import Callable, Dict, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
-from config import create_speech_config
+from config import create_speech_config, SPEECH_MAX_FILE_JOBS
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of file jobs waiting for a free recognizer
+FILE_JOB_QUEUE_SIZE = 32
+# Number of finished file jobs kept around for their results
+MAX_FILE_JOB_HISTORY = 64
+
+
+class _HistoryBuffer:
+    """Recognized lines, joined into a single string only after they change"""
+
+    def __init__(self):
+        """Initialize an empty history"""
+        self._parts: List[str] = []
+        self._text = ""
+        self._dirty = False
+
+    def append(self, line: str) -> None:
+        """
+        Add a recognized line to the history
+
+        Args:
+            line (str): Line to add, including its trailing newline
+        """
+        self._parts.append(line)
+        self._dirty = True
+
+    def clear(self) -> None:
+        """Remove all lines from the history"""
+        self._parts = []
+        self._text = ""
+        self._dirty = False
+
+    @property
+    def text(self) -> str:
+        """The whole history as one string, cached between appends"""
+        if self._dirty:
+            self._text = "".join(self._parts)
+            self._dirty = False
+        return self._text
+
 
 class SpeechRecognitionService:
     """Service class for Azure Speech Recognition functionality"""
 
     def __init__(self):
         """Initialize Speech Recognition Service"""
+        # Speech configs are built once and shared by every recognizer; the
+        # diarization settings live on a second config so they never leak
+        # into plain recognition
         self.speech_config = create_speech_config()
+        self.diarization_speech_config = create_speech_config()
+        self.diarization_speech_config.set_property(
+            property_id=speechsdk.PropertyId.SpeechServiceResponse_PostProcessingOption,
+            value="TrueText",
+        )
+        self.diarization_speech_config.set_property(
+            property_id=speechsdk.PropertyId.SpeechServiceResponse_DiarizeIntermediateResults,
+            value="true",
+        )
 
         # Recognition state
         self.recognizing_text = ""
-        self.recognized_history = ""
+        self.history = _HistoryBuffer()
         self.is_listening = False
         self.is_stopping = False  # New flag to track stopping state
-        self.is_file_processing = False
         self.recognizer = None
-        self.file_recognizer = None
 
         # Diarization settings
         self.use_diarization = False
         self.conversation_transcriber = None
-        self.file_conversation_transcriber = None
 
-        # For tracking file processing
-        self.file_audio_length = None
-        self.file_session_stopped = False
+        # File recognition jobs, run by a pool of queue workers
+        self.file_jobs: Dict[str, FileRecognitionJob] = {}
+        # Latest job id of each browser session, keyed by Gradio session hash
+        self.session_file_jobs: Dict[str, str] = {}
+        self._job_queue = None
+        self._workers = []
 
         # Thread safety
         self.update_lock = threading.Lock()
 
+    @property
+    def recognized_history(self) -> str:
+        """The recognized text so far"""
+        return self.history.text
+
     def recognizing_callback(self, evt):
         """Callback for intermediate recognition results"""
         text = evt.result.text
@@ -63,13 +121,13 @@ class SpeechRecognitionService:
             logger.debug(f"RECOGNIZED (Speaker {speaker_id}): {text}")
             if text.strip():
                 with self.update_lock:
-                    self.recognized_history += f"Speaker {speaker_id}: {text}\n"
+                    self.history.append(f"Speaker {speaker_id}: {text}\n")
                     self.recognizing_text = ""
         else:
             logger.debug(f"RECOGNIZED: {text}")
             if text.strip():
                 with self.update_lock:
-                    self.recognized_history += text + "\n"
+                    self.history.append(text + "\n")
                     self.recognizing_text = ""
 
     def session_started_callback(self, evt):
@@ -94,13 +152,6 @@ class SpeechRecognitionService:
         """Callback for speech end detection"""
         logger.debug(f"SPEECH END DETECTED")
 
-    def file_processing_completed_callback(self, evt):
-        """Callback for file processing completion"""
-        logger.debug(f"File processing completed or stopped: {evt}")
-        # Don't immediately set is_file_processing to False
-        # We'll wait a bit longer to ensure all recognition results are received
-        self.file_session_stopped = True
-
     def connect_callbacks(self, recognizer):
         """Connect all callbacks to the recognizer"""
         recognizer.recognizing.connect(self.recognizing_callback)
@@ -113,12 +164,6 @@ class SpeechRecognitionService:
             self.session_stopped_callback
         )  # Add canceled handler
 
-    def connect_file_callbacks(self, recognizer):
-        """Connect all callbacks for file recognition"""
-        self.connect_callbacks(recognizer)
-        recognizer.canceled.connect(self.file_processing_completed_callback)
-        recognizer.session_stopped.connect(self.file_processing_completed_callback)
-
     def configure_diarization(self, enable: bool):
         """
         Configure diarization settings
@@ -129,19 +174,20 @@ class SpeechRecognitionService:
         self.use_diarization = enable
         logger.info(f"Diarization settings updated: enabled={enable}")
 
-    def setup_speech_config(self):
-        """Set up speech config with current diarization settings"""
-        if self.use_diarization:
-            # Configure the speech config for diarization
-            self.speech_config.set_property(
-                property_id=speechsdk.PropertyId.SpeechServiceResponse_PostProcessingOption,
-                value="TrueText",
-            )
-            self.speech_config.set_property(
-                property_id=speechsdk.PropertyId.SpeechServiceResponse_DiarizeIntermediateResults,
-                value="true",
-            )
-            logger.debug(f"Speech config configured for diarization")
+    def setup_speech_config(self, use_diarization: Optional[bool] = None):
+        """
+        Get the preloaded speech config matching the diarization settings
+
+        Args:
+            use_diarization (Optional[bool]): Override for the service-wide setting
+
+        Returns:
+            speechsdk.SpeechConfig: Speech config to create the recognizer with
+        """
+        if use_diarization is None:
+            use_diarization = self.use_diarization
+        if use_diarization:
+            return self.diarization_speech_config
         return self.speech_config
 
     def start_microphone_recognition(self) -> bool:
@@ -159,8 +205,8 @@ class SpeechRecognitionService:
             logger.debug("Creating audio config for microphone")
             audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
 
-            # Apply diarization settings to speech config
-            self.setup_speech_config()
+            # Pick the speech config matching the diarization settings
+            speech_config = self.setup_speech_config()
 
             logger.debug("Creating recognizer")
             if self.use_diarization:
@@ -168,7 +214,7 @@ class SpeechRecognitionService:
                 logger.debug("Using ConversationTranscriber for diarization")
                 self.conversation_transcriber = (
                     speechsdk.transcription.ConversationTranscriber(
-                        speech_config=self.speech_config, audio_config=audio_config
+                        speech_config=speech_config, audio_config=audio_config
                     )
                 )
                 # Connect callbacks
@@ -190,7 +236,7 @@ class SpeechRecognitionService:
             else:
                 # Use standard SpeechRecognizer
                 self.recognizer = speechsdk.SpeechRecognizer(
-                    speech_config=self.speech_config, audio_config=audio_config
+                    speech_config=speech_config, audio_config=audio_config
                 )
                 # Connect all callbacks
                 logger.debug("Connecting callbacks")
@@ -249,7 +295,7 @@ class SpeechRecognitionService:
         """
         with self.update_lock:
             current_recognizing = self.recognizing_text
-            current_history = self.recognized_history
+            current_history = self.history.text
             is_listening_now = self.is_listening
             is_stopping_now = self.is_stopping
 
@@ -269,132 +315,430 @@ class SpeechRecognitionService:
         """Clear the recognition history"""
         logger.info("Clearing history")
         with self.update_lock:
-            self.recognized_history = ""
+            self.history.clear()
             self.recognizing_text = ""
 
-    def start_file_recognition(self, file_path: str) -> bool:
+    # File recognition jobs
+
+    def get_file_job(self, job_id: Optional[str]) -> Optional["FileRecognitionJob"]:
         """
-        Start speech recognition from a file
+        Look up a file recognition job
 
         Args:
-            file_path (str): Path to the audio file
+            job_id (Optional[str]): Job id returned when the job was submitted
 
         Returns:
-            bool: True if started successfully, False otherwise
+            Optional[FileRecognitionJob]: The job, or None if unknown
+        """
+        if not job_id:
+            return None
+        return self.file_jobs.get(job_id)
+
+    def get_session_file_job(
+        self, session_id: Optional[str]
+    ) -> Optional["FileRecognitionJob"]:
         """
+        Look up the latest file recognition job of a browser session
+
+        Args:
+            session_id (Optional[str]): Gradio session hash
+
+        Returns:
+            Optional[FileRecognitionJob]: The job, or None if the session has none
+        """
+        if not session_id:
+            return None
+        return self.get_file_job(self.session_file_jobs.get(session_id))
+
+    async def submit_file_job(self, job: "FileRecognitionJob") -> bool:
+        """
+        Queue a file recognition job; must be called from the event loop
+
+        Args:
+            job (FileRecognitionJob): Job to queue
+
+        Returns:
+            bool: True if queued, False if the queue is full
+        """
+        if self._job_queue is None:
+            # Created lazily so the queue and workers bind to the running loop
+            self._job_queue = asyncio.Queue(maxsize=FILE_JOB_QUEUE_SIZE)
+            self._workers = [
+                asyncio.create_task(self._file_worker())
+                for _ in range(SPEECH_MAX_FILE_JOBS)
+            ]
+
+        job.loop = asyncio.get_running_loop()
         try:
-            # Clear previous recognition data
-            with self.update_lock:
-                self.recognizing_text = ""
-                self.recognized_history = ""
+            self._job_queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.warning("File recognition queue is full")
+            return False
 
-            # Reset file processing state
-            self.file_session_stopped = False
+        # Forget the oldest finished jobs so the registry stays bounded
+        finished = [
+            old_job_id
+            for old_job_id, old_job in self.file_jobs.items()
+            if old_job.session_stopped
+        ]
+        excess = max(0, len(self.file_jobs) - MAX_FILE_JOB_HISTORY)
+        for old_job_id in finished[:excess]:
+            old_job = self.file_jobs.pop(old_job_id)
+            if self.session_file_jobs.get(old_job.session_id) == old_job_id:
+                del self.session_file_jobs[old_job.session_id]
+
+        self.file_jobs[job.job_id] = job
+        if job.session_id:
+            self.session_file_jobs[job.session_id] = job.job_id
+        logger.info(f"Queued file recognition job {job.job_id}")
+        return True
+
+    async def _file_worker(self):
+        """Take jobs off the queue and run them one at a time"""
+        while True:
+            job = await self._job_queue.get()
+            try:
+                # Skip jobs that were stopped while still queued
+                if job.session_stopped:
+                    continue
+                if await asyncio.to_thread(self._start_file_job, job):
+                    # Hold this worker's slot until the recognizer is done
+                    await job.done_event.wait()
+            except Exception as e:
+                logger.error(f"Error running file recognition job {job.job_id}: {e}")
+                job.mark_finished(failed=True)
+            finally:
+                self._job_queue.task_done()
+
+    def _start_file_job(self, job: "FileRecognitionJob") -> bool:
+        """
+        Create a recognizer for the job and start it (blocking)
 
-            logger.debug(f"Creating audio config for file: {file_path}")
-            audio_config = speechsdk.audio.AudioConfig(filename=file_path)
+        Args:
+            job (FileRecognitionJob): Job to start
 
-            # Apply diarization settings to speech config
-            self.setup_speech_config()
+        Returns:
+            bool: True if started successfully, False otherwise
+        """
+        try:
+            logger.debug(f"Creating audio config for file: {job.file_path}")
+            audio_config = speechsdk.audio.AudioConfig(filename=job.file_path)
+
+            # Pick the speech config matching the diarization settings
+            speech_config = self.setup_speech_config(job.use_diarization)
 
             logger.debug("Creating file recognizer")
-            if self.use_diarization:
+            if job.use_diarization:
                 # Use ConversationTranscriber for diarization
                 logger.debug("Using ConversationTranscriber for file diarization")
-                self.file_conversation_transcriber = (
-                    speechsdk.transcription.ConversationTranscriber(
-                        speech_config=self.speech_config, audio_config=audio_config
-                    )
-                )
-
-                # Connect callbacks
-                self.file_conversation_transcriber.transcribing.connect(
-                    self.recognizing_callback
-                )
-                self.file_conversation_transcriber.transcribed.connect(
-                    self.recognized_callback
+                recognizer = speechsdk.transcription.ConversationTranscriber(
+                    speech_config=speech_config, audio_config=audio_config
                 )
-                self.file_conversation_transcriber.session_stopped.connect(
-                    self.file_processing_completed_callback
-                )
-                self.file_conversation_transcriber.canceled.connect(
-                    self.file_processing_completed_callback
-                )
-
-                # Start transcription
-                logger.info("Starting file transcription with diarization")
-                self.is_file_processing = True
-                self.file_conversation_transcriber.start_transcribing_async()
+                recognizer.transcribing.connect(job.recognizing_callback)
+                recognizer.transcribed.connect(job.recognized_callback)
             else:
                 # Use standard SpeechRecognizer
-                self.file_recognizer = speechsdk.SpeechRecognizer(
-                    speech_config=self.speech_config, audio_config=audio_config
+                recognizer = speechsdk.SpeechRecognizer(
+                    speech_config=speech_config, audio_config=audio_config
                 )
+                recognizer.recognizing.connect(job.recognizing_callback)
+                recognizer.recognized.connect(job.recognized_callback)
+            recognizer.session_stopped.connect(job.session_stopped_callback)
+            recognizer.canceled.connect(job.session_stopped_callback)
 
-                # Connect all callbacks
-                logger.debug("Connecting file recognition callbacks")
-                self.connect_file_callbacks(self.file_recognizer)
+            if not job.mark_processing(recognizer):
+                logger.info(f"File recognition job {job.job_id} stopped before start")
+                return False
 
-                # Start continuous recognition
+            if job.use_diarization:
+                logger.info("Starting file transcription with diarization")
+                recognizer.start_transcribing_async()
+            else:
                 logger.info("Starting file recognition")
-                self.is_file_processing = True
-                self.file_recognizer.start_continuous_recognition()
+                recognizer.start_continuous_recognition()
 
             return True
         except Exception as e:
             logger.error(f"Error starting file recognition: {e}")
-            self.is_file_processing = False
+            job.mark_finished(failed=True)
             return False
 
-    def stop_file_recognition(self) -> bool:
+    def stop_file_job(self, job_id: Optional[str]) -> bool:
         """
-        Stop the file speech recognition process
+        Stop a queued or running file recognition job (blocking)
+
+        Args:
+            job_id (Optional[str]): Id of the job to stop
 
         Returns:
             bool: True if stopped successfully, False otherwise
         """
-        try:
-            if not self.is_file_processing:
-                logger.info("No file is currently being processed")
-                return False
+        job = self.get_file_job(job_id)
+        if job is None or job.session_stopped:
+            logger.info("No file is currently being processed")
+            return False
 
-            logger.info("Stopping file recognition")
-            if self.use_diarization and self.file_conversation_transcriber:
-                self.file_conversation_transcriber.stop_transcribing_async()
-                self.file_conversation_transcriber = None
-            elif self.file_recognizer:
-                self.file_recognizer.stop_continuous_recognition()
-                self.file_recognizer = None
+        # Record the user's stop first: the SDK fires session_stopped while
+        # stopping, and the first terminal state is the one reported
+        job.request_stop()
 
-            # Mark as stopped by user
-            self.is_file_processing = False
-            self.file_session_stopped = True
+        try:
+            logger.info("Stopping file recognition")
+            recognizer = job.recognizer
+            if job.use_diarization and recognizer:
+                recognizer.stop_transcribing_async()
+            elif recognizer:
+                recognizer.stop_continuous_recognition()
 
             logger.info("File recognition stopped successfully")
             return True
         except Exception as e:
             logger.error(f"Error stopping file recognition: {e}")
-            self.is_file_processing = False
-            self.file_session_stopped = True
             return False
+        finally:
+            # Mark as stopped by user
+            job.mark_finished(stopped_by_user=True)
+
+
+# File job status templates, keyed by state and then by whether diarization
+# is enabled; the only substitution left is the audio length suffix
+_STATUS_FMT = {
+    "queued": {
+        True: "Status: ⏳ File queued with diarization, waiting for a free recognizer...{}",
+        False: "Status: ⏳ File queued, waiting for a free recognizer...{}",
+    },
+    "processing": {
+        True: "Status: 📄 Processing file with diarization...{}",
+        False: "Status: 📄 Processing file...{}",
+    },
+    "complete": {
+        True: "Status: ✅ File processing with diarization complete{}",
+        False: "Status: ✅ File processing complete{}",
+    },
+}
+_STATUS_FAILED = "Status: ❌ Failed to process file"
+_STATUS_STOPPED = "Status: ⏹️ File processing stopped"
+
+
+class FileRecognitionJob:
+    """State for a single file recognition, owned by the session that queued it"""
+
+    def __init__(
+        self,
+        file_path: str,
+        use_diarization: bool = False,
+        audio_length: Optional[float] = None,
+        session_id: Optional[str] = None,
+    ):
+        """
+        Initialize a file recognition job
+
+        Args:
+            file_path (str): Path to the audio file
+            use_diarization (bool): Whether to enable diarization
+            audio_length (Optional[float]): Length of the audio file in seconds
+            session_id (Optional[str]): Gradio session hash of the owning session
+        """
+        self.job_id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.file_path = file_path
+        self.use_diarization = use_diarization
+        self.audio_length = audio_length
+
+        # Recognition state
+        self.recognizing_text = ""
+        # Recognized phrases as [speaker, offset in seconds, text] rows,
+        # appended in place; readers get _rows_snapshot, a copy taken only
+        # when rows were added since the last read
+        self.history_rows: List[List[Any]] = []
+        self._rows_snapshot: List[List[Any]] = []
+        self.recognizer = None
+        self.is_queued = True
+        self.is_processing = False
+        self.session_stopped = False
+        self.stopped_by_user = False
+        self.failed = False
+        # Set when a newer job from the same session replaces this one
+        self.superseded = False
+
+        # Audio length suffix, formatted once for every status line
+        self._length_info = (
+            f" (Audio length: {audio_length:.2f} seconds)" if audio_length else ""
+        )
+        # Current status line, rebuilt only on state transitions
+        self.status = self._format_status("queued")
+
+        # Thread safety
+        self.update_lock = threading.Lock()
+
+        # Event loop the job was submitted from; SDK threads signal the events
+        # below through it, so waiting on them never ties up a thread
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Signaled by SDK callbacks whenever there is something new to display
+        self.update_event = asyncio.Event()
+        # Set once the job has finished, stopped, or failed
+        self.done_event = asyncio.Event()
+
+    def _signal(self, event: asyncio.Event) -> None:
+        """
+        Set one of the job's events from any thread
+
+        Args:
+            event (asyncio.Event): update_event or done_event
+        """
+        if self.loop is None:
+            # Not submitted yet, so the caller is on the event loop
+            event.set()
+            return
+        try:
+            self.loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The loop has shut down; nobody is waiting any more
+            pass
+
+    def recognizing_callback(self, evt):
+        """Callback for intermediate recognition results"""
+        text = evt.result.text
+        speaker_id = getattr(evt.result, "speaker_id", None)
+
+        if speaker_id and self.use_diarization:
+            text = f"Speaker {speaker_id}: {text}"
+        logger.debug(f"RECOGNIZING (file): {text}")
+        with self.update_lock:
+            self.recognizing_text = text
+        self._signal(self.update_event)
+
+    def recognized_callback(self, evt):
+        """Callback for final recognition results"""
+        text = evt.result.text
+        speaker_id = getattr(evt.result, "speaker_id", None)
+
+        logger.debug(f"RECOGNIZED (file): {text}")
+        if text.strip():
+            speaker = speaker_id if speaker_id and self.use_diarization else ""
+            # Offsets are reported in 100-nanosecond ticks
+            offset = round(evt.result.offset / 10_000_000, 2)
+            with self.update_lock:
+                self.history_rows.append([speaker, offset, text])
+                self.recognizing_text = ""
+        self._signal(self.update_event)
+
+    def session_stopped_callback(self, evt):
+        """Callback for file processing completion"""
+        logger.debug(f"File processing completed or stopped: {evt}")
+        self.mark_finished()
+
+    def mark_processing(self, recognizer) -> bool:
+        """
+        Record that the recognizer is about to start
+
+        Args:
+            recognizer: Recognizer created for this job
+
+        Returns:
+            bool: False if the job was stopped in the meantime
+        """
+        with self.update_lock:
+            if self.session_stopped:
+                return False
+            self.recognizer = recognizer
+            self.is_queued = False
+            self.is_processing = True
+            self.status = self._format_status("processing")
+        self._signal(self.update_event)
+        return True
+
+    def request_stop(self) -> None:
+        """Record that the user asked to stop the job, before the recognizer stops"""
+        with self.update_lock:
+            if not self.session_stopped:
+                self.stopped_by_user = True
+
+    def mark_finished(self, stopped_by_user: bool = False, failed: bool = False):
+        """
+        Record that the job is over and wake anyone waiting on it
 
-    def get_file_processing_status(self) -> str:
+        Only the first call sets the final state; a stop requested with
+        request_stop is reported as stopped even if the recognizer finishes first.
+
+        Args:
+            stopped_by_user (bool): Whether the user stopped the job
+            failed (bool): Whether the job failed to start
+        """
+        with self.update_lock:
+            if not self.session_stopped:
+                stopped_by_user = stopped_by_user or self.stopped_by_user
+                self.stopped_by_user = stopped_by_user
+                self.failed = failed
+                if failed:
+                    self.status = _STATUS_FAILED
+                elif stopped_by_user:
+                    self.status = _STATUS_STOPPED
+                else:
+                    self.status = self._format_status("complete")
+            self.recognizer = None
+            self.is_queued = False
+            self.is_processing = False
+            self.session_stopped = True
+        self._signal(self.update_event)
+        self._signal(self.done_event)
+
+    def clear_update(self) -> None:
+        """Forget pending update signals; call before reading the job's state"""
+        self.update_event.clear()
+
+    async def wait_for_update(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a recognition callback signals new results
+
+        Returns at once if results changed since the last clear_update, so
+        clearing before reading the state means no update is ever missed.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait in seconds
+
+        Returns:
+            bool: True if an update was signaled, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self.update_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_recognition_status(self) -> Tuple[str, str, List[List[Any]]]:
+        """
+        Get the current status and recognized text of the job
+
+        Returns:
+            Tuple[str, str, List[List[Any]]]: Status message, current recognizing
+                text, history rows of [speaker, offset in seconds, text]
+        """
+        with self.update_lock:
+            if len(self._rows_snapshot) != len(self.history_rows):
+                self._rows_snapshot = list(self.history_rows)
+            return self.status, self.recognizing_text, self._rows_snapshot
+
+    def get_status(self) -> str:
         """
         Get the current file processing status
 
         Returns:
             str: Status message
         """
-        if self.is_file_processing:
-            diarization_info = " with diarization" if self.use_diarization else ""
-            if self.file_audio_length:
-                return f"Status: 📄 Processing file{diarization_info}... (Audio length: {self.file_audio_length:.2f} seconds)"
-            return f"Status: 📄 Processing file{diarization_info}..."
-        else:
-            diarization_info = " with diarization" if self.use_diarization else ""
-            if self.file_audio_length:
-                return f"Status: ✅ File processing{diarization_info} complete (Audio length: {self.file_audio_length:.2f} seconds)"
-            return f"Status: ✅ File processing{diarization_info} complete"
+        return self.status
+
+    def _format_status(self, state: str) -> str:
+        """
+        Build the status line for a job state
+
+        Args:
+            state (str): One of "queued", "processing" or "complete"
+
+        Returns:
+            str: Status message
+        """
+        return _STATUS_FMT[state][bool(self.use_diarization)].format(self._length_info)
 
 
 # Create a singleton instance
@@ -8,7 +8,16 @@ import json
 import asyncio
 import time
 import logging
-from typing import Optional, Dict, Any, Callable, AsyncGenerator
+from typing import Optional, Callable, AsyncGenerator, NamedTuple
+
+# orjson parses frames noticeably faster when it is installed; its decode
+# error subclasses json.JSONDecodeError, so error handling is the same
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Add notebooks directory to path to import the base transcription service
 notebooks_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../notebooks"))
@@ -20,6 +29,21 @@ from transcription_websocket_service import TranscriptionService
 
 logger = logging.getLogger(__name__)
 
+# Number of messages handled between explicit yields to the event loop, so a
+# burst of buffered frames can't starve Gradio's UI updates (must be a power of 2)
+YIELD_EVERY = 32
+
+
+class StreamEvent(NamedTuple):
+    """A transcription event streamed to the UI"""
+
+    event_type: str  # "delta", "transcript", "status" or "error"
+    data: str  # Text for delta/transcript, message for status/error
+    current_text: str = ""  # Accumulated text of the current turn (delta events only)
+    seq: int = 0  # Monotonic completion number (transcript events only)
+    time_remaining: Optional[int] = None  # Seconds left (status events only)
+    timestamp: float = 0.0  # When the event occurred
+
 
 class StreamingTranscriptionService(TranscriptionService):
     """
@@ -29,7 +53,7 @@ class StreamingTranscriptionService(TranscriptionService):
     making it suitable for integration with Gradio's async UI updates.
     """
     
-    async def stream_transcription(self, duration=30, event_callback=None) -> AsyncGenerator[Dict[str, Any], None]:
+    async def stream_transcription(self, duration=30, event_callback=None) -> AsyncGenerator[StreamEvent, None]:
         """
         Stream real-time transcription with specified duration, yielding events as they occur
 
@@ -40,15 +64,18 @@ class StreamingTranscriptionService(TranscriptionService):
                             "delta", "transcript", "status", "error"
 
         Yields:
-            Dictionaries with transcription events containing:
+            StreamEvent tuples with:
             - event_type: "delta" (incremental update), "transcript" (completed), 
                         "status" (status update), or "error"
             - data: The content of the event (text for delta/transcript, message for status/error)
+            - current_text: Accumulated text of the current turn (delta events only)
+            - seq: Monotonic completion number (transcript events only)
+            - time_remaining: Seconds of recording left (status events only)
             - timestamp: When the event occurred
         """
         # Check if already recording
         if self.is_recording:
-            yield {"event_type": "error", "data": "Already recording", "timestamp": time.time()}
+            yield StreamEvent(event_type="error", data="Already recording", timestamp=time.time())
             return
 
         # Clear audio queue
@@ -59,6 +86,7 @@ class StreamingTranscriptionService(TranscriptionService):
         self.transcribed_text = []
         self.probs = []
         self.current_transcription = ""
+        self._completion_seq = 0
 
         # Set recording flag
         self.is_recording = True
@@ -70,11 +98,11 @@ class StreamingTranscriptionService(TranscriptionService):
         audio_thread.start()
 
         # Yield initial status
-        yield {
-            "event_type": "status", 
-            "data": f"Starting transcription for {duration} seconds",
-            "timestamp": time.time()
-        }
+        yield StreamEvent(
+            event_type="status", 
+            data=f"Starting transcription for {duration} seconds",
+            timestamp=time.time()
+        )
 
         # Set up the custom message handlers for streaming
         original_handlers = self.message_handlers.copy()
@@ -88,12 +116,12 @@ class StreamingTranscriptionService(TranscriptionService):
             if original_handlers["conversation.item.input_audio_transcription.delta"]:
                 original_handlers["conversation.item.input_audio_transcription.delta"](msg)
             
-            event = {
-                "event_type": "delta",
-                "data": delta,
-                "current_text": self.current_transcription,
-                "timestamp": time.time()
-            }
+            event = StreamEvent(
+                event_type="delta",
+                data=delta,
+                current_text=self.current_transcription,
+                timestamp=time.time()
+            )
             await message_queue.put(event)
             if event_callback:
                 event_callback("delta", delta)
@@ -113,12 +141,15 @@ class StreamingTranscriptionService(TranscriptionService):
             else:
                 transcript = msg.get("transcript", "")
             
-            event = {
-                "event_type": "transcript",
-                "data": transcript,
-                "transcript_history": list(self.transcribed_text),
-                "timestamp": time.time()
-            }
+            # Send only the new segment with a sequence number; the consumer
+            # accumulates history, avoiding a full history copy per completion
+            self._completion_seq += 1
+            event = StreamEvent(
+                event_type="transcript",
+                data=transcript,
+                seq=self._completion_seq,
+                timestamp=time.time()
+            )
             await message_queue.put(event)
             if event_callback:
                 event_callback("transcript", transcript)
@@ -127,11 +158,11 @@ class StreamingTranscriptionService(TranscriptionService):
         async def queue_speech_started(msg):
             if "input_audio_buffer.speech_started" in original_handlers:
                 original_handlers["input_audio_buffer.speech_started"](msg)
-            event = {
-                "event_type": "status",
-                "data": "Speech detected, listening...",
-                "timestamp": time.time()
-            }
+            event = StreamEvent(
+                event_type="status",
+                data="Speech detected, listening...",
+                timestamp=time.time()
+            )
             await message_queue.put(event)
             if event_callback:
                 event_callback("status", "Speech detected")
@@ -139,11 +170,11 @@ class StreamingTranscriptionService(TranscriptionService):
         async def queue_speech_stopped(msg):
             if "input_audio_buffer.speech_stopped" in original_handlers:
                 original_handlers["input_audio_buffer.speech_stopped"](msg)
-            event = {
-                "event_type": "status",
-                "data": "Speech stopped",
-                "timestamp": time.time()
-            }
+            event = StreamEvent(
+                event_type="status",
+                data="Speech stopped",
+                timestamp=time.time()
+            )
             await message_queue.put(event)
             if event_callback:
                 event_callback("status", "Speech stopped")
@@ -152,11 +183,11 @@ class StreamingTranscriptionService(TranscriptionService):
             if "error" in original_handlers:
                 original_handlers["error"](msg)
             error_msg = msg.get("message", "Unknown error")
-            event = {
-                "event_type": "error",
-                "data": error_msg,
-                "timestamp": time.time()
-            }
+            event = StreamEvent(
+                event_type="error",
+                data=error_msg,
+                timestamp=time.time()
+            )
             await message_queue.put(event)
             if event_callback:
                 event_callback("error", error_msg)
@@ -173,12 +204,17 @@ class StreamingTranscriptionService(TranscriptionService):
         # Create a wrapper for websocket receive that uses our streaming handlers
         async def streaming_receive_messages(websocket):
             """Modified receive_messages that uses streaming handlers"""
+            n_messages = 0
             try:
                 while True:
                     try:
-                        message = await websocket.recv()
+                        # Raw bytes: the JSON parser decodes UTF-8 itself
+                        message = await websocket.recv(decode=False)
+                        n_messages += 1
+                        if n_messages & (YIELD_EVERY - 1) == 0:
+                            await asyncio.sleep(0)
                         try:
-                            msg = json.loads(message)
+                            msg = _json_loads(message)
                             msg_type = msg.get("type")
                             
                             # Call the appropriate streaming handler based on message type
@@ -188,32 +224,32 @@ class StreamingTranscriptionService(TranscriptionService):
                                 # For other message types, just pass to original handler
                                 handler = original_handlers.get(
                                     msg_type, 
-                                    lambda m: print(f"ℹ️ Message type: {m.get('type')}", flush=True)
+                                    lambda m: logger.debug("Message type: %s", m.get("type"))
                                 )
                                 if callable(handler):
                                     handler(msg)
                                 
                                 # Also queue status messages for certain events
                                 if msg_type in ["transcription_session.created", "transcription_session.updated"]:
-                                    event = {
-                                        "event_type": "status",
-                                        "data": f"{msg_type.replace('_', ' ').title()}",
-                                        "timestamp": time.time()
-                                    }
+                                    event = StreamEvent(
+                                        event_type="status",
+                                        data=f"{msg_type.replace('_', ' ').title()}",
+                                        timestamp=time.time()
+                                    )
                                     await message_queue.put(event)
                                     if event_callback:
-                                        event_callback("status", event["data"])
+                                        event_callback("status", event.data)
                                         
                         except json.JSONDecodeError:
-                            print(f"Received non-JSON message: {message}", flush=True)
+                            logger.warning("Received non-JSON message: %s", message)
                             
                     except websockets.exceptions.ConnectionClosedError:
                         print("\n🔌 WebSocket connection closed", flush=True)
-                        event = {
-                            "event_type": "status",
-                            "data": "WebSocket connection closed",
-                            "timestamp": time.time()
-                        }
+                        event = StreamEvent(
+                            event_type="status",
+                            data="WebSocket connection closed",
+                            timestamp=time.time()
+                        )
                         await message_queue.put(event)
                         if event_callback:
                             event_callback("status", "Connection closed")
@@ -221,21 +257,21 @@ class StreamingTranscriptionService(TranscriptionService):
                         
             except Exception as e:
                 print(f"\n❌ Error in receive_messages: {e}")
-                event = {
-                    "event_type": "error",
-                    "data": f"Error in receive_messages: {e}",
-                    "timestamp": time.time()
-                }
+                event = StreamEvent(
+                    event_type="error",
+                    data=f"Error in receive_messages: {e}",
+                    timestamp=time.time()
+                )
                 await message_queue.put(event)
                 if event_callback:
                     event_callback("error", str(e))
             finally:
                 print("📥 Message receiving complete")
-                event = {
-                    "event_type": "status",
-                    "data": "Message receiving complete",
-                    "timestamp": time.time()
-                }
+                event = StreamEvent(
+                    event_type="status",
+                    data="Message receiving complete",
+                    timestamp=time.time()
+                )
                 await message_queue.put(event)
                 if event_callback:
                     event_callback("status", "Message receiving complete")
@@ -264,37 +300,40 @@ class StreamingTranscriptionService(TranscriptionService):
             
             # Create tasks for processing the queue while we're running the WebSocket
             async def process_message_queue():
-                start_time = time.time()
                 last_time_update = 0
+                n_events = 0
                 try:
-                    while self.is_recording and (time.time() - start_time < duration):
+                    while self.is_recording and loop.time() < deadline:
                         try:
                             # Get the next message with a timeout
                             event = await asyncio.wait_for(message_queue.get(), timeout=0.1)
                             
                             # Add time remaining information to status events
-                            if event["event_type"] == "status":
-                                time_elapsed = time.time() - start_time
-                                time_remaining = max(0, duration - time_elapsed)
-                                event["time_remaining"] = round(time_remaining)
+                            if event.event_type == "status":
+                                time_remaining = max(0, deadline - loop.time())
+                                event = event._replace(time_remaining=round(time_remaining))
                                 
                             # Yield the event
                             yield event
                             # Mark the task as done
                             message_queue.task_done()
+
+                            # Periodically yield to the event loop while draining a backlog
+                            n_events += 1
+                            if n_events & (YIELD_EVERY - 1) == 0:
+                                await asyncio.sleep(0)
                         except asyncio.TimeoutError:
                             # No message available, send periodic time updates (every second)
                             current_time = int(time.time())
                             if current_time > last_time_update:
                                 last_time_update = current_time
-                                time_elapsed = time.time() - start_time
-                                time_remaining = max(0, duration - time_elapsed)
-                                yield {
-                                    "event_type": "status",
-                                    "data": f"Recording in progress. Time remaining: {round(time_remaining)} seconds",
-                                    "time_remaining": round(time_remaining),
-                                    "timestamp": time.time()
-                                }
+                                time_remaining = max(0, deadline - loop.time())
+                                yield StreamEvent(
+                                    event_type="status",
+                                    data=f"Recording in progress. Time remaining: {round(time_remaining)} seconds",
+                                    time_remaining=round(time_remaining),
+                                    timestamp=time.time()
+                                )
                 except asyncio.CancelledError:
                     print("Message queue processing cancelled")
                 except GeneratorExit:
@@ -304,36 +343,26 @@ class StreamingTranscriptionService(TranscriptionService):
                 finally:
                     print("Message queue processing completed")
             
-            # Create a termination flag
-            termination_requested = asyncio.Event()
-            
-            # Create a task to automatically end the transcription after duration
-            async def auto_terminate():
-                try:
-                    await asyncio.sleep(duration)
-                    termination_requested.set()
-                except asyncio.CancelledError:
-                    pass
-            
-            # Start the termination timer
-            termination_timer = asyncio.create_task(auto_terminate())
+            # The queue processor stops once this deadline passes
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + duration
             
             import websockets
             async with websockets.connect(ws_url, additional_headers=headers) as websocket:
                 print("🔗 WebSocket connection established")
-                yield {
-                    "event_type": "status",
-                    "data": "WebSocket connection established",
-                    "timestamp": time.time()
-                }
+                yield StreamEvent(
+                    event_type="status",
+                    data="WebSocket connection established",
+                    timestamp=time.time()
+                )
                 
                 # Send session configuration
                 await self.send_session_update(websocket)
-                yield {
-                    "event_type": "status",
-                    "data": "Session configuration sent",
-                    "timestamp": time.time()
-                }
+                yield StreamEvent(
+                    event_type="status",
+                    data="Session configuration sent",
+                    timestamp=time.time()
+                )
                 
                 # Start tasks for audio sending, message receiving, and queue processing
                 audio_task = asyncio.create_task(self.send_audio(websocket))
@@ -344,10 +373,6 @@ class StreamingTranscriptionService(TranscriptionService):
                 try:
                     async for event in queue_processor:
                         yield event
-                        
-                        # Check if termination has been requested
-                        if termination_requested.is_set():
-                            break
                 except GeneratorExit:
                     # Handle graceful shutdown when the generator is closed
                     print("🛑 Generator exit requested, shutting down gracefully")
@@ -365,28 +390,25 @@ class StreamingTranscriptionService(TranscriptionService):
         except websockets.exceptions.InvalidStatus as e:
             error_msg = f"Invalid status: {e}"
             print(f"❌ {error_msg}")
-            yield {"event_type": "error", "data": error_msg, "timestamp": time.time()}
+            yield StreamEvent(event_type="error", data=error_msg, timestamp=time.time())
         except websockets.exceptions.ConnectionClosedError as e:
             error_msg = f"Connection closed unexpectedly: {e}"
             print(f"❌ {error_msg}")
-            yield {"event_type": "error", "data": error_msg, "timestamp": time.time()}
+            yield StreamEvent(event_type="error", data=error_msg, timestamp=time.time())
         except Exception as e:
             error_msg = f"WebSocket connection error: {e}"
             print(f"❌ {error_msg}")
-            yield {"event_type": "error", "data": error_msg, "timestamp": time.time()}
+            yield StreamEvent(event_type="error", data=error_msg, timestamp=time.time())
         finally:
             # Stop recording
             self.is_recording = False
             print("✅ Transcription session ended")
-            # Cancel termination timer if it's still running
-            if not termination_timer.done():
-                termination_timer.cancel()
             # Yield final status
-            yield {
-                "event_type": "status",
-                "data": "Transcription session ended",
-                "timestamp": time.time()
-            }
+            yield StreamEvent(
+                event_type="status",
+                data="Transcription session ended",
+                timestamp=time.time()
+            )
             if event_callback:
                 event_callback("status", "Transcription session ended")
 
@@ -423,7 +445,7 @@ async def async_stream_transcription(
         event_callback: Optional callback function to process events in real-time
         
     Yields:
-        Dictionaries with transcription events
+        StreamEvent tuples with transcription events
     """
     # Create the appropriate service
     if service_type == "azure":
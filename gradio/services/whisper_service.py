@@ -58,5 +58,5 @@ def process_whisper_transcription(file_path: str) -> Tuple[str, str]:
         return status, result.text
 
     except Exception as e:
-        logger.error(f"Error during Whisper transcription: {e}")
+        logger.error("Error during Whisper transcription: %s", e)
         return "Status: ❌ Whisper Transcription error", str(e)
@@ -2,101 +2,198 @@
 File Input Tab for Azure Speech Recognition.
 Implements the UI and functionality for speech recognition from audio files.
 """
-import time
+import asyncio
 import gradio as gr
 import logging
-from typing import Tuple
+from typing import TYPE_CHECKING
 
-from services.speech_recognition import speech_service
+from config import SPEECH_UI_POLL_MS
 from utils import get_audio_length
 
+if TYPE_CHECKING:
+    from services.speech_recognition import FileRecognitionJob
+
 logger = logging.getLogger(__name__)
 
+# Result stream pacing: updates are pushed at most once per poll interval, and
+# the fallback wake-up backs off to the idle interval once results stop changing
+FILE_POLL_INTERVAL = SPEECH_UI_POLL_MS / 1000
+FILE_IDLE_INTERVAL = 2.0
+FILE_IDLE_AFTER_TICKS = 5
+
 
-def process_file(file_path, enable_diarization=False):
+def _session_id(request: gr.Request = None):
     """
-    Process the uploaded audio file
+    Get the Gradio session hash of the browser session making a request
 
     Args:
-        file_path (str): Path to the audio file
-        enable_diarization (bool): Whether to enable diarization
+        request (gr.Request): Request injected by Gradio
 
     Returns:
-        Tuple[str, str, str]: Status, recognizing text, recognized text
+        Optional[str]: Session hash, or None outside of a Gradio request
     """
-    if not file_path:
-        return ("Status: ❌ No file uploaded", "", "")
+    return getattr(request, "session_hash", None)
 
-    # Get audio file length
-    audio_length = get_audio_length(file_path)
-    speech_service.file_audio_length = audio_length
-    length_info = (
-        f"Audio length: {audio_length:.2f} seconds"
-        if audio_length
-        else "Could not determine audio length"
-    )
 
-    # Stop any ongoing recognition
-    if speech_service.is_listening:
-        speech_service.stop_microphone_recognition()
-    if speech_service.is_file_processing:
-        speech_service.stop_file_recognition()
+async def process_file(
+    file_path,
+    enable_diarization=False,
+    audio_length=None,
+    request: gr.Request = None,
+):
+    """
+    Queue the uploaded audio file for processing and stream its results
 
-    # Configure diarization settings
-    speech_service.configure_diarization(enable=enable_diarization)
+    Args:
+        file_path (str): Path to the audio file
+        enable_diarization (bool): Whether to enable diarization
+        audio_length (Optional[float]): Audio length computed on upload, if known
+        request (gr.Request): Request injected by Gradio, identifies the session
+
+    Yields:
+        Tuple[str, str, List]: Status, recognizing text, recognized history rows
+    """
+    if not file_path:
+        yield ("Status: ❌ No file uploaded", "", [])
+        return
+
+    # Imported here so building the tab does not load the Speech SDK
+    from services.speech_recognition import speech_service, FileRecognitionJob
+
+    # Get audio file length, unless it was already computed on upload
+    if audio_length is None:
+        audio_length = get_audio_length(file_path)
+
+    # Replace this session's previous job; other sessions' jobs are unaffected.
+    # Its stream ends quietly, so it can't overwrite this job's results
+    session_id = _session_id(request)
+    previous_job = speech_service.get_session_file_job(session_id)
+    if previous_job is not None:
+        previous_job.superseded = True
+        await asyncio.to_thread(speech_service.stop_file_job, previous_job.job_id)
+
+    job = FileRecognitionJob(
+        file_path,
+        use_diarization=enable_diarization,
+        audio_length=audio_length,
+        session_id=session_id,
+    )
+    if not await speech_service.submit_file_job(job):
+        yield ("Status: ❌ Too many files queued, please try again later", "", [])
+        return
 
-    success = speech_service.start_file_recognition(file_path)
+    yield (job.get_status(), "", [])
 
-    diarization_info = " with diarization" if enable_diarization else ""
-    if success:
-        return (
-            f"Status: 📄 Processing file{diarization_info}... ({length_info})",
-            "",
-            "",
-        )
-    else:
-        return ("Status: ❌ Failed to process file", "", "")
+    # Keep streaming from the same event, no second round-trip to start updates
+    async for update in stream_file_updates(job):
+        yield update
 
 
-def refresh_file_ui():
+def refresh_file_ui(request: gr.Request = None):
     """
-    Refresh the UI with the latest file recognition results and manage timer state
+    Refresh the UI with the latest file recognition results
+
+    Args:
+        request (gr.Request): Request injected by Gradio, identifies the session
 
     Returns:
-        Tuple: Status text, current recognizing, history, timer update
+        Tuple: Status text, current recognizing, history
     """
-    (
-        status,
-        current_recognizing,
-        current_history,
-    ) = speech_service.get_recognition_status()
+    from services.speech_recognition import speech_service
 
-    # Check if we should consider file processing as complete
-    # We consider it complete if the session has been marked as stopped by the SDK
-    if speech_service.is_file_processing and speech_service.file_session_stopped:
-        logger.info("File processing detected as complete")
-        speech_service.is_file_processing = False
+    job = speech_service.get_session_file_job(_session_id(request))
+    if job is None:
+        return "Status: Ready to process file", "", []
 
-    # Determine timer state based on processing status
-    timer_update = gr.update(active=speech_service.is_file_processing)
+    return job.get_recognition_status()
 
-    # Update status text based on processing state
-    status_text = speech_service.get_file_processing_status()
 
-    return status_text, current_recognizing, current_history, timer_update
+async def stream_file_updates(job: "FileRecognitionJob"):
+    """
+    Stream file recognition results to the UI as the SDK callbacks report them
 
+    Args:
+        job (FileRecognitionJob): This session's file recognition job, held for
+            the whole stream so no lookup happens per update
 
-def stop_file_processing():
+    Yields:
+        Tuple: Status text, current recognizing, history; fields that did not
+            change since the previous update are sent as empty updates
+    """
+    if job.session_stopped:
+        return
+
+    last_update = None
+    unchanged_ticks = 0
+    while True:
+        if job.superseded:
+            # A newer job from this session owns the outputs now
+            return
+
+        # Clear the signal before reading, so results reported from here on
+        # wake the next wait. Check for completion before reading the
+        # status, so the update sent before stopping includes the final status
+        job.clear_update()
+        done = job.session_stopped
+        update = job.get_recognition_status()
+        if update == last_update:
+            unchanged_ticks += 1
+        else:
+            unchanged_ticks = 0
+            if last_update is None:
+                yield update
+            else:
+                # Only push the fields that changed
+                yield tuple(
+                    gr.update() if value == previous else value
+                    for value, previous in zip(update, last_update)
+                )
+            last_update = update
+
+        if done:
+            break
+
+        # Coalesce bursts of callbacks into one push per poll interval, then
+        # wait for the recognizer to signal new results
+        await asyncio.sleep(FILE_POLL_INTERVAL)
+        timeout = (
+            FILE_IDLE_INTERVAL
+            if unchanged_ticks >= FILE_IDLE_AFTER_TICKS
+            else FILE_POLL_INTERVAL
+        )
+        await job.wait_for_update(timeout)
+
+
+async def stop_file_processing(request: gr.Request = None):
     """
     Stop file processing and update UI
 
+    Args:
+        request (gr.Request): Request injected by Gradio, identifies the session
+
     Returns:
         Tuple: Updated UI components
     """
-    speech_service.stop_file_recognition()
+    from services.speech_recognition import speech_service
+
     status = "Status: ⏹️ File processing stopped"
-    _, current_recognizing, current_history = speech_service.get_recognition_status()
-    return status, current_recognizing, current_history, gr.update(active=False)
+    job = speech_service.get_session_file_job(_session_id(request))
+    if job is None:
+        return status, "", []
+
+    await asyncio.to_thread(speech_service.stop_file_job, job.job_id)
+    _, current_recognizing, current_history = job.get_recognition_status()
+    return status, current_recognizing, current_history
+
+
+def clear_file_results():
+    """
+    Clear the displayed file recognition results
+
+    Returns:
+        Tuple: Cleared UI components
+    """
+    return "Status: Results cleared", "", []
 
 
 def display_file_info(file_path):
@@ -107,10 +204,11 @@ def display_file_info(file_path):
         file_path (str): Path to the audio file
 
     Returns:
-        Tuple[str, str, str]: Status, recognizing text, history
+        Tuple[str, str, List, Optional[float]]: Status, recognizing text, history
+            rows, audio length to reuse when processing
     """
     if not file_path:
-        return "Status: Ready to process file", "", ""
+        return "Status: Ready to process file", "", [], None
 
     # Get audio file length
     audio_length = get_audio_length(file_path)
@@ -118,10 +216,16 @@ def display_file_info(file_path):
         return (
             f"Status: File uploaded. Audio length: {audio_length:.2f} seconds",
             "",
-            "",
+            [],
+            audio_length,
         )
     else:
-        return "Status: File uploaded. Could not determine audio length.", "", ""
+        return (
+            "Status: File uploaded. Could not determine audio length.",
+            "",
+            [],
+            None,
+        )
 
 
 def create_file_tab() -> gr.Tab:
@@ -165,12 +269,20 @@ def create_file_tab() -> gr.Tab:
                     label="Currently Recognizing",
                     placeholder="Waiting for file processing...",
                 )
-                file_recognized_display = gr.Textbox(
-                    label="Recognition Results", lines=10
+                # One row per recognized phrase, so long transcripts render
+                # as a table rather than one ever-growing text box
+                file_recognized_display = gr.Dataframe(
+                    label="Recognition Results",
+                    headers=["Speaker", "Time", "Text"],
+                    datatype=["str", "number", "str"],
+                    row_count=(0, "dynamic"),
+                    col_count=(3, "fixed"),
+                    wrap=True,
+                    interactive=False,
                 )
 
-        # Add timer for periodic updates
-        file_timer = gr.Timer(value=0.1, active=False)
+        # Audio length computed on upload, reused when processing starts
+        file_audio_length = gr.State(None)
 
         # Show file information when a file is uploaded
         file_input.change(
@@ -180,49 +292,39 @@ def create_file_tab() -> gr.Tab:
                 file_status_text,
                 file_recognizing_display,
                 file_recognized_display,
+                file_audio_length,
             ],
         )
 
-        # Connect file processing functions with diarization parameters
-        process_button.click(
+        # Connect file processing functions with diarization parameters;
+        # results stream to the UI as the recognizer reports them. Each stream
+        # lasts the whole transcription, so Gradio must not limit the event to
+        # one at a time: the service's job queue bounds the recognizers instead
+        file_stream = process_button.click(
             process_file,
-            inputs=[file_input, enable_diarization],
-            outputs=[
-                file_status_text,
-                file_recognizing_display,
-                file_recognized_display,
-            ],
-        )
-
-        # Start the timer when processing begins
-        process_button.click(
-            lambda: gr.update(active=True), inputs=None, outputs=[file_timer]
-        )
-
-        # Modified timer tick function to check if processing is complete and update UI
-        file_timer.tick(
-            refresh_file_ui,
-            inputs=None,
+            inputs=[file_input, enable_diarization, file_audio_length],
             outputs=[
                 file_status_text,
                 file_recognizing_display,
                 file_recognized_display,
-                file_timer,
             ],
+            concurrency_limit=None,
+            # A click while a file is processing replaces it with a new job
+            trigger_mode="multiple",
         )
 
+        # Clearing the results also stops streaming updates into them
         file_clear_button.click(
-            lambda: ("Status: Results cleared", "", "", gr.update(active=False)),
+            clear_file_results,
             inputs=None,
             outputs=[
                 file_status_text,
                 file_recognizing_display,
                 file_recognized_display,
-                file_timer,
             ],
+            cancels=[file_stream],
         )
 
-        # Enhanced refresh button to update UI and timer status
         file_refresh_button.click(
             refresh_file_ui,
             inputs=None,
@@ -230,7 +332,6 @@ def create_file_tab() -> gr.Tab:
                 file_status_text,
                 file_recognizing_display,
                 file_recognized_display,
-                file_timer,
             ],
         )
 
@@ -242,7 +343,6 @@ def create_file_tab() -> gr.Tab:
                 file_status_text,
                 file_recognizing_display,
                 file_recognized_display,
-                file_timer,
             ],
         )
 
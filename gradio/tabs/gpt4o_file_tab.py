@@ -5,11 +5,47 @@ Implements the UI and functionality for Azure OpenAI GPT-4o-transcribe file tran
 import gradio as gr
 import logging
 
-from services.gpt4o_file_service import process_gpt4o_file_transcription
+from services.gpt4o_file_service import stream_gpt4o_file_transcription
 
 logger = logging.getLogger(__name__)
 
 
+def toggle_visualization_format(include_logprobs):
+    """Show the visualization format options only when confidence scores are enabled"""
+    return gr.update(visible=include_logprobs)
+
+
+async def process_gpt4o_with_options(file_path, prompt, include_probs, viz_format):
+    """
+    Transcribe the uploaded file with GPT-4o, streaming partial results to the UI
+
+    Args:
+        file_path (str): Path to the audio file
+        prompt (str): Optional prompt to guide transcription
+        include_probs (bool): Whether to include confidence scores
+        viz_format (str): How to visualize confidence scores (html, markdown, text)
+
+    Yields:
+        Tuple[str, str]: Status message and transcription result so far
+    """
+    if not file_path:
+        yield "Status: ❌ No file uploaded", ""
+        return
+
+    async for status, result in stream_gpt4o_file_transcription(
+        file_path=file_path,
+        prompt=prompt,
+        include_logprobs=include_probs,
+        visualization_format=viz_format
+    ):
+        yield status, result
+
+
+def clear_gpt4o_results():
+    """Clear the GPT-4o transcription results"""
+    return "Status: Ready for GPT-4o transcription", ""
+
+
 def create_gpt4o_file_tab() -> gr.Tab:
     """
     Create the GPT-4o File Transcription tab
@@ -62,26 +98,12 @@ def create_gpt4o_file_tab() -> gr.Tab:
 
         # Show/hide visualization format options based on confidence scores checkbox
         include_logprobs.change(
-            lambda x: gr.update(visible=x),
+            toggle_visualization_format,
             inputs=[include_logprobs],
             outputs=[visualization_format]
         )
 
-        # Connect GPT-4o transcription functions
-        def process_gpt4o_with_options(file_path, prompt, include_probs, viz_format):
-            if not file_path:
-                return "Status: ❌ No file uploaded", ""
-                
-            status, result = process_gpt4o_file_transcription(
-                file_path=file_path,
-                prompt=prompt,
-                response_format="text",
-                include_logprobs=include_probs,
-                visualization_format=viz_format
-            )
-            
-            return status, result
-                
+        # Connect GPT-4o transcription functions, streaming partial results to the UI
         gpt4o_process_button.click(
             process_gpt4o_with_options,
             inputs=[gpt4o_file_input, gpt4o_prompt, include_logprobs, visualization_format],
@@ -90,7 +112,7 @@ def create_gpt4o_file_tab() -> gr.Tab:
 
         # Clear results
         gpt4o_clear_button.click(
-            lambda: ("Status: Ready for GPT-4o transcription", ""),
+            clear_gpt4o_results,
             inputs=None,
             outputs=[gpt4o_status_text, gpt4o_transcription_display],
         )
@@ -108,7 +130,7 @@ def create_gpt4o_file_tab() -> gr.Tab:
                  - **Markdown**: Plain text with summary of low-confidence words at the end
                  - **Text**: Plain text only
             3. Click 'Process with GPT-4o' to send the file to Azure OpenAI GPT-4o-transcribe model
-            4. Once complete, the full transcript will appear in the results box
+            4. The transcript appears in the results box as it is generated
 
             **Note**: This uses Azure OpenAI's GPT-4o-transcribe model for high-quality transcription and is separate from the Whisper model.
 
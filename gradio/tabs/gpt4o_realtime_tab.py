@@ -4,22 +4,91 @@ Implements the UI and functionality for real-time transcription using WebSockets
 """
 import gradio as gr
 import logging
-import os
-import sys
 import time
+import uuid
 import asyncio
-from typing import Dict, Any
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Any, Optional
 
-# Add the notebooks directory to path
-notebooks_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../notebooks"))
-if notebooks_dir not in sys.path:
-    sys.path.append(notebooks_dir)
-
-# Import the streaming service
-from services.streaming_transcription_service import async_stream_transcription
+# Import the streaming service (it puts the notebooks directory on sys.path)
+from services.streaming_transcription_service import async_stream_transcription, StreamEvent
 
 logger = logging.getLogger(__name__)
 
+# Number of real-time sessions kept around for their history
+MAX_REALTIME_SESSIONS = 64
+# Number of transcript segments kept per session; older ones are dropped
+MAX_REALTIME_HISTORY = 1000
+
+# Streamed deltas are folded into the current text at most this often (seconds)
+DELTA_FLUSH_INTERVAL = 0.03
+
+# Status line shown for a status event, by keyword found in the lowercased
+# message (first match wins); other status events leave the status unchanged
+STATUS_HANDLERS = {
+    "speech detected": "Status: 🗣️ Speech detected, listening... ({remaining:.0f}s remaining)",
+    "speech stopped": "Status: 🎙️ Waiting for speech... ({remaining:.0f}s remaining)",
+    "error": "Status: ⚠️ {message}",
+    "closed": "Status: ⚠️ {message}",
+}
+
+
+@dataclass(slots=True)
+class RealtimeSession:
+    """Mutable state of one browser session's real-time transcription"""
+
+    is_recording: bool = False
+    current_text: str = ""
+    history: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=MAX_REALTIME_HISTORY)
+    )
+    history_text: str = ""  # history joined by newlines, kept up to date on append
+    termination_event: Optional[asyncio.Event] = None  # Signals termination, reused per recording
+    loop: Optional[asyncio.AbstractEventLoop] = None  # Loop running the recording
+    run_id: int = 0  # Bumped by every recording, so a finished run can tell it was replaced
+
+
+# Sessions by id; gr.State only holds the id, so Gradio never copies the
+# session or the event and loop it references
+_sessions: "OrderedDict[str, RealtimeSession]" = OrderedDict()
+
+
+def get_realtime_session(session_id: Optional[str]) -> Optional[RealtimeSession]:
+    """
+    Look up a real-time transcription session
+
+    Args:
+        session_id (Optional[str]): Id held in the tab's gr.State
+
+    Returns:
+        Optional[RealtimeSession]: The session, or None if unknown
+    """
+    if not session_id:
+        return None
+    return _sessions.get(session_id)
+
+
+def create_realtime_session() -> str:
+    """
+    Register a new real-time transcription session
+
+    Returns:
+        str: Id of the new session
+    """
+    # Forget the oldest idle sessions so the registry stays bounded
+    idle = [
+        old_id for old_id, old_session in _sessions.items()
+        if not old_session.is_recording
+    ]
+    excess = max(0, len(_sessions) + 1 - MAX_REALTIME_SESSIONS)
+    for old_id in idle[:excess]:
+        del _sessions[old_id]
+
+    session_id = uuid.uuid4().hex
+    _sessions[session_id] = RealtimeSession()
+    return session_id
+
 
 def create_gpt4o_realtime_tab() -> gr.Tab:
     """
@@ -93,25 +162,21 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
                     placeholder="Transcription will appear here while you speak"
                 )
 
-        # Global state to store transcription results and control
-        state = gr.State({
-            "is_recording": False,
-            "current_text": "",
-            "history": [],
-            "termination_event": None,  # AsyncEvent for signaling termination
-            "loop": None,  # Reference to the event loop
-            "cancel_requested": False   # Flag for cancellation
-        })
+        # Id of this browser session's RealtimeSession
+        state = gr.State("")
         
         # Function to clear the transcription history
-        def clear_results(state_dict):
+        async def clear_results(session_id):
             """Clear all transcription results"""
-            state_dict["current_text"] = ""
-            state_dict["history"] = []
-            return "Status: 🧹 Transcription history cleared", "", state_dict
+            session = get_realtime_session(session_id)
+            if session is not None:
+                session.current_text = ""
+                session.history.clear()
+                session.history_text = ""
+            return "Status: 🧹 Transcription history cleared", ""
         
         # Update the duration info when the slider changes
-        def update_duration_info(duration):
+        async def update_duration_info(duration):
             """Update the duration info message based on slider value"""
             return f"Recording will run for **{duration} seconds** unless stopped manually"
         
@@ -124,26 +189,41 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
         
         # Function to actually start the async transcription process
         async def run_async_transcription(
-            service_type_val, model_val, noise_red_val, threshold_val, duration_val, state_dict
+            service_type_val, model_val, noise_red_val, threshold_val, duration_val, session_id
         ):
             """Run the async streaming transcription and update the UI"""
+            session = get_realtime_session(session_id)
+            if session is None:
+                yield "Status: ❌ Error: Recording session not found", ""
+                return
+            
+            # Claim the session; a newer recording bumps run_id again
+            session.run_id += 1
+            run_id = session.run_id
+            
             try:
-                # Create an asyncio event for termination signaling
-                termination_event = asyncio.Event()
-                state_dict["termination_event"] = termination_event
-                state_dict["cancel_requested"] = False
+                # Reuse the session's termination event across recordings
+                if session.termination_event is None:
+                    session.termination_event = asyncio.Event()
+                termination_event = session.termination_event
+                termination_event.clear()
                 
                 # Store the current event loop
-                state_dict["loop"] = asyncio.get_event_loop()
+                session.loop = asyncio.get_running_loop()
                 
                 # Set recording flag
-                state_dict["is_recording"] = True
+                session.is_recording = True
+                
+                # Deadline on the monotonic clock, computed once for the whole
+                # recording; the status lines count down against it
+                _now = time.monotonic
+                end_time = _now() + duration_val
                 
                 # Convert noise reduction setting
                 if noise_red_val == "none":
                     noise_red_val = None
                 
-                logger.debug(f"Starting async transcription with service_type={service_type_val}, model={model_val}")
+                logger.debug("Starting async transcription with service_type=%s, model=%s", service_type_val, model_val)
                 
                 # Process streaming events
                 status_text = f"Status: 🎙️ Recording in progress... (will run for {duration_val} seconds)"
@@ -151,166 +231,235 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
                 
                 # Set up a generator that will exit when termination is requested
                 async def event_generator():
+                    stream = async_stream_transcription(
+                        service_type=service_type_val,
+                        model=model_val,
+                        noise_reduction=noise_red_val,
+                        turn_threshold=threshold_val,
+                        include_logprobs=True,  # Always include for proper operation
+                        duration=duration_val
+                    )
+                    # Race every next event against termination, so a stop request
+                    # wakes this coroutine once instead of being polled per event
+                    termination_task = asyncio.ensure_future(termination_event.wait())
+                    next_task = None
                     try:
-                        async for event in async_stream_transcription(
-                            service_type=service_type_val,
-                            model=model_val,
-                            noise_reduction=noise_red_val,
-                            turn_threshold=threshold_val,
-                            include_logprobs=True,  # Always include for proper operation
-                            duration=duration_val
-                        ):
-                            # Check if termination was requested
-                            if termination_event.is_set() or state_dict.get("cancel_requested", False):
-                                logger.debug("Termination requested, breaking event loop")
+                        while True:
+                            next_task = asyncio.ensure_future(stream.__anext__())
+                            await asyncio.wait(
+                                {next_task, termination_task},
+                                return_when=asyncio.FIRST_COMPLETED
+                            )
+                            if not next_task.done():
+                                logger.debug("Termination requested, stopping event stream")
                                 break
+                            try:
+                                event = next_task.result()
+                            except StopAsyncIteration:
+                                break
+                            next_task = None
                             
                             # Yield the event
                             yield event
                     except Exception as e:
                         logger.error(f"Error in event generator: {e}", exc_info=True)
                         # Yield an error event
-                        yield {
-                            "event_type": "error",
-                            "data": f"Error in streaming: {str(e)}",
-                            "timestamp": time.time()
-                        }
+                        yield StreamEvent(
+                            event_type="error",
+                            data=f"Error in streaming: {str(e)}",
+                            timestamp=time.time()
+                        )
+                    finally:
+                        termination_task.cancel()
+                        if next_task is not None and not next_task.done():
+                            # Let the stream unwind its connection before closing it
+                            next_task.cancel()
+                            await asyncio.gather(next_task, return_exceptions=True)
+                        await stream.aclose()
+                
+                # Deltas arriving in quick succession are buffered and folded into
+                # current_text together, instead of one concatenation per delta
+                delta_parts = []
+                server_text = None
+                last_flush = _now()
+                
+                def flush_deltas(now):
+                    """Fold the buffered deltas into the session's current text"""
+                    nonlocal server_text, last_flush
+                    delta = "".join(delta_parts)
+                    delta_parts.clear()
+                    if server_text is not None:
+                        session.current_text = server_text
+                    else:
+                        session.current_text += delta
+                    server_text = None
+                    last_flush = now
+                    
+                    # Log the deltas if significant
+                    if logger.isEnabledFor(logging.DEBUG) and delta.strip():
+                        logger.debug(f"Delta: '{delta}', Current: '{session.current_text[:30]}...'")
                 
                 # Process events and update UI
                 has_started = False
                 async for event in event_generator():
-                    event_type = event.get("event_type")
-                    logger.debug(f"Received event: {event_type}")
+                    event_type = event.event_type
+                    logger.debug("Received event: %s", event_type)
+                    # Read the clock once per event, for both the delta flush
+                    # and the remaining-time countdown
+                    now = _now()
                     
                     # Mark that we've started receiving events
                     has_started = True
                     
-                    # Check for termination again
-                    if termination_event.is_set() or state_dict.get("cancel_requested", False):
-                        logger.debug("Termination check during event processing - breaking loop")
-                        break
-                    
                     if event_type == "delta":
-                        # Incremental transcription update - aggregate in current_text
-                        delta = event.get("data", "")
-                        current_text = event.get("current_text", state_dict["current_text"] + delta)
-                        state_dict["current_text"] = current_text
-                        
-                        # Log the delta if significant
-                        if len(delta.strip()) > 0:
-                            logger.debug(f"Delta: '{delta}', Current: '{current_text[:30]}...'")
-                            
-                    elif event_type == "transcript":
+                        # Empty deltas (keep-alives, token boundaries) change nothing
+                        if not event.data:
+                            continue
+                        # Incremental transcription update - buffered until the
+                        # flush interval passes or another event arrives
+                        delta_parts.append(event.data)
+                        server_text = event.current_text or server_text
+                        if now - last_flush < DELTA_FLUSH_INTERVAL:
+                            continue
+                    
+                    if delta_parts:
+                        flush_deltas(now)
+                    
+                    if event_type == "transcript":
                         # Completed transcript segment
-                        transcript = event.get("data", "")
-                        logger.debug(f"Completed transcript: '{transcript[:30]}...'")
+                        transcript = event.data
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Completed transcript: '{transcript[:30]}...'")
                         
-                        # Add to history
-                        if transcript.strip():
-                            state_dict["history"].append(transcript)
-                            history_text = "\n".join(state_dict["history"])
-                            
-                            # Yield the updates - only update on complete transcripts
-                            yield status_text, history_text, state_dict
-                            
                         # Reset current text
-                        state_dict["current_text"] = ""
+                        session.current_text = ""
+                        
+                        # Whitespace-only segments are not added to history
+                        if not transcript.strip():
+                            continue
+                        
+                        # Add to history
+                        if len(session.history) == session.history.maxlen:
+                            # The oldest segment falls out of the bounded history
+                            evicted = session.history[0]
+                            session.history_text = session.history_text[len(evicted) + 1:]
+                        session.history.append(transcript)
+                        # Extend the joined text rather than re-joining every segment
+                        if session.history_text:
+                            session.history_text += "\n" + transcript
+                        else:
+                            session.history_text = transcript
+                        history_text = session.history_text
+                        
+                        # Yield the updates - only update on complete transcripts
+                        yield status_text, history_text
                         
                     elif event_type == "status":
                         # Status update
-                        status_msg = event.get("data", "")
-                        logger.debug(f"Status update: {status_msg}")
+                        status_msg = event.data
+                        logger.debug("Status update: %s", status_msg)
                         
-                        # Update status if needed
-                        if "speech detected" in status_msg.lower():
-                            status_text = f"Status: 🗣️ Speech detected, listening... ({duration_val - (time.time() - event.get('timestamp', time.time())):.0f}s remaining)"
-                            # Yield status update
-                            yield status_text, history_text, state_dict
-                        elif "speech stopped" in status_msg.lower():
-                            status_text = f"Status: 🎙️ Waiting for speech... ({duration_val - (time.time() - event.get('timestamp', time.time())):.0f}s remaining)"
-                            # Yield status update
-                            yield status_text, history_text, state_dict
-                        elif "error" in status_msg.lower() or "closed" in status_msg.lower():
-                            status_text = f"Status: ⚠️ {status_msg}"
+                        # Update status if needed, lowercasing the message once
+                        status_lower = status_msg.lower()
+                        template = next(
+                            (
+                                template for keyword, template in STATUS_HANDLERS.items()
+                                if keyword in status_lower
+                            ),
+                            None
+                        )
+                        if template is not None:
+                            status_text = template.format(
+                                remaining=max(0, end_time - now), message=status_msg
+                            )
                             # Yield status update
-                            yield status_text, history_text, state_dict
+                            yield status_text, history_text
                         
                     elif event_type == "error":
                         # Error message
-                        error_msg = event.get("data", "")
+                        error_msg = event.data
                         logger.error(f"Error in transcription: {error_msg}")
                         
                         # Update status
                         status_text = f"Status: ❌ Error: {error_msg}"
                         
                         # Yield the updates
-                        yield status_text, history_text, state_dict
+                        yield status_text, history_text
+                
+                if delta_parts:
+                    flush_deltas(_now())
                 
                 # Check if we started but didn't receive any events
                 if not has_started:
                     logger.warning("No events received from transcription service")
-                    yield "Status: ⚠️ No events received from transcription service", history_text, state_dict
+                    yield "Status: ⚠️ No events received from transcription service", history_text
                 
                 # Done processing, update final state
-                state_dict["is_recording"] = False
-                if termination_event.is_set() or state_dict.get("cancel_requested", False):
+                if session.run_id == run_id:
+                    session.is_recording = False
+                if termination_event.is_set():
                     status_text = "Status: ⏹️ Recording stopped by user"
                 else:
                     status_text = "Status: ✅ Recording complete"
                 
                 # Yield final state
-                yield status_text, history_text, state_dict
+                yield status_text, history_text
                 
             except Exception as e:
                 # Log and handle any exceptions
                 logger.error(f"Error in transcription: {e}", exc_info=True)
-                state_dict["is_recording"] = False
+                if session.run_id == run_id:
+                    session.is_recording = False
                 status_text = f"Status: ❌ Error: {str(e)}"
-                history_text = "\n".join(state_dict.get("history", []))
+                history_text = session.history_text
                 
                 # Yield error state
-                yield status_text, history_text, state_dict
+                yield status_text, history_text
             finally:
-                # Ensure state is cleaned up
-                state_dict["is_recording"] = False
-                state_dict["termination_event"] = None
-                state_dict["loop"] = None
-                state_dict["cancel_requested"] = False
+                # Ensure state is cleaned up, unless a newer recording on this
+                # session has taken over the event and loop
+                if session.run_id == run_id:
+                    session.is_recording = False
+                    session.termination_event.clear()
+                    session.loop = None
         
         # Function called when the start button is clicked
-        def start_recording(
-            service_type_val, model_val, noise_red_val, threshold_val, duration_val, state_dict
+        async def start_recording(
+            service_type_val, model_val, noise_red_val, threshold_val, duration_val, session_id
         ):
             """Start recording and transcription"""
+            session = get_realtime_session(session_id)
+            if session is None:
+                session_id = create_realtime_session()
+                session = _sessions[session_id]
+            
             # Check if already recording
-            if state_dict.get("is_recording", False):
+            if session.is_recording:
                 return "Status: ⚠️ Already recording", \
-                       "\n".join(state_dict.get("history", [])), state_dict
+                       session.history_text, session_id
             
             # Reset state
-            state_dict["current_text"] = ""
-            state_dict["history"] = []
-            state_dict["cancel_requested"] = False
+            session.current_text = ""
+            session.history.clear()
+            session.history_text = ""
             
-            logger.debug(f"Starting recording with service_type={service_type_val}, model={model_val}")
+            logger.debug("Starting recording with service_type=%s, model=%s", service_type_val, model_val)
             
             # Return initial status and state - this will trigger the async function
-            return gr.update(value=f"Status: 🎙️ Starting recording... (will run for {duration_val} seconds)"), "", state_dict
+            return gr.update(value=f"Status: 🎙️ Starting recording... (will run for {duration_val} seconds)"), "", session_id
         
         # Function called when the stop button is clicked
-        def stop_recording(state_dict):
+        async def stop_recording(session_id):
             """Stop the current recording"""
+            session = get_realtime_session(session_id)
             # Check if recording
-            if not state_dict.get("is_recording", False):
-                return "Status: Not currently recording", \
-                       "\n".join(state_dict.get("history", [])), state_dict
-            
-            # Mark cancellation requested immediately
-            state_dict["cancel_requested"] = True
+            if session is None or not session.is_recording:
+                history_text = session.history_text if session is not None else ""
+                return "Status: Not currently recording", history_text
             
             # Signal termination if possible
-            termination_event = state_dict.get("termination_event")
-            loop = state_dict.get("loop")
+            termination_event = session.termination_event
+            loop = session.loop
             
             if termination_event and loop:
                 try:
@@ -321,10 +470,9 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
                     logger.error(f"Error setting termination event: {e}")
             
             # Update state - mark recording as stopped even if event setting failed
-            state_dict["is_recording"] = False
+            session.is_recording = False
             
-            return "Status: ⏹️ Stopping recording...", \
-                   "\n".join(state_dict.get("history", [])), state_dict
+            return "Status: ⏹️ Stopping recording...", session.history_text
         
         # Connect the buttons to functions
         start_button.click(
@@ -354,8 +502,7 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
             ],
             outputs=[
                 realtime_status_text,
-                transcription_history,
-                state
+                transcription_history
             ]
         )
         
@@ -364,8 +511,7 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
             inputs=[state],
             outputs=[
                 realtime_status_text,
-                transcription_history,
-                state
+                transcription_history
             ]
         )
         
@@ -374,8 +520,7 @@ def create_gpt4o_realtime_tab() -> gr.Tab:
             inputs=[state],
             outputs=[
                 realtime_status_text,
-                transcription_history,
-                state
+                transcription_history
             ]
         )
 
@@ -2,6 +2,7 @@
 Microphone Input Tab for Azure Speech Recognition.
 Implements the UI and functionality for speech recognition from microphone.
 """
+import asyncio
 import gradio as gr
 import logging
 from typing import Tuple
@@ -10,8 +11,19 @@ from services.speech_recognition import speech_service
 
 logger = logging.getLogger(__name__)
 
+# Refresh timer interval (seconds) while a phrase is being recognized, and
+# while listening to silence
+MIC_ACTIVE_INTERVAL = 0.1
+MIC_IDLE_INTERVAL = 0.25
 
-def toggle_recognition(enable_diarization=False):
+# Updates shared by every refresh. Only updates without a "value" are shared:
+# Gradio pops "value" from an update dict when applying it
+_NO_UPDATE = gr.update()
+_TIMER_ON = gr.update(active=True)
+_TIMER_OFF = gr.update(active=False)
+
+
+async def toggle_recognition(enable_diarization=False):
     """
     Toggle between starting and stopping recognition
 
@@ -22,14 +34,16 @@ def toggle_recognition(enable_diarization=False):
         # Set diarization options before starting
         speech_service.configure_diarization(enable=enable_diarization)
 
-        success = speech_service.start_microphone_recognition()
+        # Opening the microphone and creating the recognizer can block, so
+        # keep it off the event loop
+        success = await asyncio.to_thread(speech_service.start_microphone_recognition)
         if success:
             diarization_info = " with diarization" if enable_diarization else ""
             # Return active=True for the timer when starting listening
             return (
                 gr.update(visible=True, value=f"Stop Listening{diarization_info}"),
                 *speech_service.get_recognition_status(),
-                gr.update(active=True),
+                _TIMER_ON,
             )
         else:
             return (
@@ -37,40 +51,63 @@ def toggle_recognition(enable_diarization=False):
                 "Status: ❌ Failed to start",
                 "",
                 "",
-                gr.update(active=False),
+                _TIMER_OFF,
             )
     else:
-        success = speech_service.stop_microphone_recognition()
+        success = await asyncio.to_thread(speech_service.stop_microphone_recognition)
         # Show stopping state but keep timer active to continue refreshing UI
         return (
             gr.update(value="Stopping...", interactive=False),
             "Status: ⏳ Stopping recognition...",
             speech_service.recognizing_text,
             speech_service.recognized_history,
-            gr.update(active=True),  # Keep timer active to refresh UI
+            _TIMER_ON,  # Keep timer active to refresh UI
         )
 
 
-def refresh_ui():
-    """Refresh the UI with the latest recognition results"""
+async def refresh_ui(last_update=None):
+    """
+    Refresh the UI with the latest recognition results
+
+    Args:
+        last_update (Optional[Tuple]): Status, recognizing text, history and
+            timer interval pushed by the previous refresh, if any
+
+    Returns:
+        Tuple: UI updates, with unchanged fields sent as empty updates, and
+            the values to compare the next refresh against
+    """
     logger.debug("Refreshing UI")
     status, recognizing, history = speech_service.get_recognition_status()
+    # Tick fast only while a phrase is being recognized
+    interval = MIC_ACTIVE_INTERVAL if recognizing else MIC_IDLE_INTERVAL
+    current_update = (status, recognizing, history, interval)
 
     # Update button state and timer state based on service state
     if not speech_service.is_listening and not speech_service.is_stopping:
         # If not listening and not stopping, stop the timer and reset button
         button_update = gr.update(value="Start Listening", interactive=True)
-        timer_update = gr.update(active=False)  # Stop the timer
+        timer_update = _TIMER_OFF  # Stop the timer
+    elif last_update is None or last_update[3] != interval:
+        # If listening or stopping, keep timer active at the current pace
+        button_update = _NO_UPDATE
+        timer_update = gr.update(active=True, value=interval)
     else:
-        # If listening or stopping, keep timer active
-        button_update = gr.update()
-        timer_update = gr.update(active=True)
+        button_update = _NO_UPDATE
+        timer_update = _NO_UPDATE
+
+    # Only push the text fields that changed since the previous refresh
+    if last_update is not None:
+        status, recognizing, history = (
+            _NO_UPDATE if value == previous else value
+            for value, previous in zip(current_update[:3], last_update[:3])
+        )
 
     # Return all expected values, including timer update
-    return status, recognizing, history, button_update, timer_update
+    return status, recognizing, history, button_update, timer_update, current_update
 
 
-def clear_history():
+async def clear_history():
     """Clear the recognition history"""
     speech_service.clear_history()
     return speech_service.get_recognition_status()
@@ -118,18 +155,21 @@ def create_microphone_tab() -> gr.Tab:
                 recognized_display = gr.Textbox(label="Recognition History", lines=10)
 
         # Add timer for periodic updates (initially inactive)
-        timer = gr.Timer(value=0.1, active=False)
+        timer = gr.Timer(value=MIC_IDLE_INTERVAL, active=False)
+        # Values pushed by the last timer refresh, to skip unchanged fields
+        last_refresh = gr.State(None)
 
         # Connect timer tick to refresh function - now also updates the timer itself
         timer.tick(
             refresh_ui,
-            inputs=None,
+            inputs=[last_refresh],
             outputs=[
                 status_text,
                 recognizing_display,
                 recognized_display,
                 listen_button,
                 timer,
+                last_refresh,
             ],
         )
 
@@ -152,7 +192,7 @@ def create_microphone_tab() -> gr.Tab:
             outputs=[status_text, recognizing_display, recognized_display],
         )
 
-        # Update manual refresh to match the updated refresh_ui return values
+        # Manual refresh always pushes every field
         manual_refresh.click(
             refresh_ui,
             inputs=None,
@@ -162,6 +202,7 @@ def create_microphone_tab() -> gr.Tab:
                 recognized_display,
                 listen_button,
                 timer,
+                last_refresh,
             ],
         )
 
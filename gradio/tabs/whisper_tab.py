@@ -10,6 +10,11 @@ from services.whisper_service import process_whisper_transcription
 logger = logging.getLogger(__name__)
 
 
+async def clear_whisper_results():
+    """Clear the Whisper transcription results"""
+    return "Status: Ready for Whisper transcription", ""
+
+
 def create_whisper_tab() -> gr.Tab:
     """
     Create the Whisper transcription tab
@@ -45,7 +50,7 @@ def create_whisper_tab() -> gr.Tab:
 
         # Clear results
         whisper_clear_button.click(
-            lambda: ("Status: Ready for Whisper transcription", ""),
+            clear_whisper_results,
             inputs=None,
             outputs=[whisper_status_text, whisper_transcription_display],
         )
@@ -3,15 +3,62 @@ Utility functions for the Azure Speech Recognition application.
 """
 import time
 import os
-import soundfile as sf
+import functools
+import struct
+from collections import OrderedDict
 import logging
 import json
-import numpy as np
-import html
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Union, Tuple
+
+# numpy and soundfile are imported where they're used, so importing these
+# helpers doesn't load them
+if TYPE_CHECKING:
+    import numpy as np
+
+# orjson parses transcription JSON several times faster when installed; its
+# error subclasses json.JSONDecodeError, so error handling is the same
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# WAV header bytes scanned for the fmt and data chunks before falling back to libsndfile
+WAV_HEADER_SCAN_BYTES = 4096
+# PCM, IEEE float and WAVE_FORMAT_EXTENSIBLE have a constant byte rate
+_WAV_CONSTANT_RATE_FORMATS = (0x0001, 0x0003, 0xFFFE)
+
+# Formatted transcriptions kept for re-renders of the same JSON result
+FORMATTED_CACHE_SIZE = 128
+_formatted_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+# Same escapes as html.escape(quote=True), applied in one str.translate pass
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+# Styles for confidence-scored transcriptions, loaded once with the page
+CONFIDENCE_CSS = """
+.confidence-text {
+    font-family: sans-serif;
+    line-height: 1.5;
+    white-space: pre-wrap;
+}
+.confidence-text span {
+    cursor: pointer;
+}
+"""
+
+# Span colors indexed by confidence in hundredths of a percent, the precision
+# probabilities are rounded to (red for low, green for high)
+_CONFIDENCE_COLORS = tuple(
+    f"rgb({int(255 * (1 - i / 10000))}, {int(255 * (i / 10000))}, 0)"
+    for i in range(10001)
+)
+
 
 def get_audio_length(file_path: str) -> Optional[float]:
     """
@@ -24,9 +71,83 @@ def get_audio_length(file_path: str) -> Optional[float]:
         Optional[float]: Length of audio file in seconds or None if error occurs
     """
     try:
-        with sf.SoundFile(file_path) as f:
-            length_seconds = f.frames / f.samplerate
-            return length_seconds
+        stat = os.stat(file_path)
+    except OSError as e:
+        logger.error(f"Error getting audio length: {e}")
+        return None
+
+    # Key the cache on modification time and size so a replaced file is re-read
+    return _read_audio_length(file_path, stat.st_mtime, stat.st_size)
+
+
+def _read_wav_length(file_path: str, size: int) -> Optional[float]:
+    """
+    Compute the length of a PCM WAV file from its header alone
+
+    Args:
+        file_path (str): Path to the audio file
+        size (int): Size of the file in bytes
+
+    Returns:
+        Optional[float]: Length in seconds, or None if the file is not a WAV
+            file this can handle
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(WAV_HEADER_SCAN_BYTES)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+
+    # Walk the chunks: fmt gives the byte rate, data gives the audio size
+    byte_rate = None
+    offset = 12
+    while offset + 8 <= len(header):
+        chunk_id = header[offset:offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", header, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if body + 12 > len(header):
+                return None
+            audio_format, _, _, byte_rate = struct.unpack_from("<HHII", header, body)
+            if audio_format not in _WAV_CONSTANT_RATE_FORMATS or not byte_rate:
+                return None
+        elif chunk_id == b"data":
+            if byte_rate is None:
+                return None
+            # Streamed WAVs may leave the size unset; trust the file size then
+            data_size = min(chunk_size, size - body) if chunk_size else size - body
+            return data_size / byte_rate
+        # Chunks are padded to an even number of bytes
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+@functools.lru_cache(maxsize=128)
+def _read_audio_length(file_path: str, mtime: float, size: int) -> Optional[float]:
+    """Read the audio length from the file (cached by get_audio_length)"""
+    try:
+        # Plain WAV files need nothing more than their header
+        wav_length = _read_wav_length(file_path, size)
+        if wav_length is not None:
+            return wav_length
+    except (OSError, struct.error) as e:
+        logger.debug(f"Could not parse WAV header, using soundfile: {e}")
+
+    try:
+        import soundfile as sf
+
+        # Only the header is parsed, the audio data is not decoded
+        return sf.info(file_path).duration
+    except RuntimeError:
+        # libsndfile can't parse this format (e.g. m4a), ask ffprobe instead
+        pass
+    except Exception as e:
+        logger.error(f"Error getting audio length: {e}")
+        return None
+
+    try:
+        from pydub.utils import mediainfo
+
+        return float(mediainfo(file_path)["duration"])
     except Exception as e:
         logger.error(f"Error getting audio length: {e}")
         return None
@@ -70,12 +191,44 @@ def process_transcription_with_confidence(
     Returns:
         str: Formatted transcription with confidence scores
     """
+    # Only string results are cached: they are hashable and can't change
+    # under the cache, unlike response objects
+    if not isinstance(transcription_result, str):
+        return _format_transcription(transcription_result, format_type)
+
+    key = (format_type, transcription_result)
+    cached = _formatted_cache.get(key)
+    if cached is not None:
+        _formatted_cache.move_to_end(key)
+        return cached
+
+    formatted = _format_transcription(transcription_result, format_type)
+    _formatted_cache[key] = formatted
+    if len(_formatted_cache) > FORMATTED_CACHE_SIZE:
+        _formatted_cache.popitem(last=False)
+    return formatted
+
+
+def _format_transcription(
+    transcription_result: Union[str, Dict, Any], format_type: str
+) -> str:
+    """Format a transcription result (cached by process_transcription_with_confidence)"""
     try:
+        # OpenAI response objects carry the text and logprobs directly
+        # (strings and dicts have no logprobs attribute)
+        logprobs = getattr(transcription_result, 'logprobs', None)
+        if logprobs is not None:
+            return _format_with_logprobs(transcription_result.text, logprobs, format_type)
+
         # If the result is already a string and not a JSON object
         if isinstance(transcription_result, str):
+            # Plain text can't be JSON unless it starts like an object or array
+            stripped = transcription_result.lstrip()
+            if not stripped or stripped[0] not in "{[":
+                return transcription_result
             try:
                 # Try to parse it as JSON
-                result = json.loads(transcription_result)
+                result = _json_loads(transcription_result)
             except json.JSONDecodeError:
                 # If it's not valid JSON, just return the string
                 return transcription_result
@@ -98,19 +251,9 @@ def process_transcription_with_confidence(
                 return result['text']
             else:
                 return str(result)
-                
-        # If we have no logprobs, just return the text
-        if not logprobs:
-            return text
-            
-        # Process based on format type
-        if format_type == "html":
-            return format_confidence_scores_html(text, logprobs)
-        elif format_type == "markdown":
-            return format_confidence_scores_markdown(text, logprobs)
-        else:  # text
-            return text
-            
+
+        return _format_with_logprobs(text, logprobs, format_type)
+
     except Exception as e:
         logger.error(f"Error processing transcription with confidence: {e}")
         # Return original transcription if there's an error
@@ -122,6 +265,55 @@ def process_transcription_with_confidence(
             return str(transcription_result)
 
 
+def _format_with_logprobs(text: str, logprobs: Optional[List], format_type: str) -> str:
+    """
+    Format transcription text with its confidence scores
+
+    Args:
+        text: The transcription text
+        logprobs: List of log probability objects, if any
+        format_type: The type of formatting to use ("html", "markdown", or "text")
+
+    Returns:
+        str: Formatted transcription with confidence scores
+    """
+    # If we have no logprobs, just return the text
+    if not logprobs:
+        return text
+
+    # Process based on format type
+    if format_type == "html":
+        return format_confidence_scores_html(text, logprobs)
+    elif format_type == "markdown":
+        return format_confidence_scores_markdown(text, logprobs)
+    else:  # text
+        return text
+
+
+def _token_probabilities(logprobs: List) -> Tuple[List[str], "np.ndarray"]:
+    """
+    Split log probability objects into tokens and their confidence
+
+    Args:
+        logprobs: List of log probability objects
+
+    Returns:
+        Tuple[List[str], np.ndarray]: Tokens, and their probability as a
+            percentage rounded to 2 decimals
+    """
+    import numpy as np
+
+    tokens = [lp.token if hasattr(lp, 'token') else lp['token'] for lp in logprobs]
+    log_probs = np.fromiter(
+        (lp.logprob if hasattr(lp, 'logprob') else lp['logprob'] for lp in logprobs),
+        dtype=np.float64,
+        count=len(logprobs),
+    )
+
+    # Convert all log probabilities to probabilities (0-100%) in one pass
+    return tokens, np.round(np.exp(log_probs) * 100, 2)
+
+
 def format_confidence_scores_html(text: str, logprobs: List) -> str:
     """
     Format transcription with HTML-based confidence visualization
@@ -133,81 +325,71 @@ def format_confidence_scores_html(text: str, logprobs: List) -> str:
     Returns:
         str: HTML formatted text with color-coded confidence scores
     """
-    html_output = "<div class='confidence-text'>"
-    
-    # Create a map of positions to tokens and their confidence
-    token_map = {}
-    
-    current_position = 0
-    for lp in logprobs:
-        # Get the token and its probability (convert from log probability)
-        token = lp.token if hasattr(lp, 'token') else lp['token']
-        log_prob = lp.logprob if hasattr(lp, 'logprob') else lp['logprob']
-        
-        # Convert log probability to probability (0-100%)
-        probability = np.round(np.exp(log_prob) * 100, 2)
-        
-        # Store the token and its probability
-        token_length = len(token)
-        token_map[current_position] = {
-            'token': token,
-            'probability': probability,
-            'length': token_length
-        }
-        current_position += token_length
-    
-    # Now create the HTML with colored spans
-    processed_text = ""
+    return wrap_confidence_html(format_confidence_spans(text, logprobs))
+
+
+def format_confidence_spans(text: str, logprobs: List) -> str:
+    """
+    Render transcription text as color-coded spans, without the surrounding markup
+
+    Spans rendered for consecutive pieces of a transcript can be concatenated,
+    which lets streamed transcriptions be rendered incrementally.
+
+    Args:
+        text: The transcription text
+        logprobs: List of log probability objects
+
+    Returns:
+        str: HTML spans with color-coded confidence scores
+    """
+    # Tokens cover the text in order, so walk them once and join at the end
+    tokens, probabilities = _token_probabilities(logprobs)
+    parts = []
     current_position = 0
-    remaining_text = text
-    
-    for pos, token_info in sorted(token_map.items()):
-        # Handle any text before this token
-        if pos > current_position:
-            prefix_text = remaining_text[:pos - current_position]
-            processed_text += html.escape(prefix_text)
-            remaining_text = remaining_text[pos - current_position:]
-            current_position = pos
-        
-        # Process the token
-        token = token_info['token']
-        probability = token_info['probability']
-        token_length = token_info['length']
-        
-        # Generate color based on probability (green for high confidence, red for low)
-        r = int(255 * (1 - probability / 100))
-        g = int(255 * (probability / 100))
-        b = 0
-        
+    for token, probability in zip(tokens, probabilities.tolist()):
+        # Look up color based on probability (green for high confidence, red for low)
+        color = _CONFIDENCE_COLORS[round(probability * 100)]
+
+        # Show the text the token covers, so the output always matches the
+        # transcript even if a token's spelling differs from it
+        end = current_position + len(token)
+        token_text = text[current_position:end] or token
+
         # Create a span with the color and a tooltip
-        processed_text += f"<span style='color: rgb({r}, {g}, {b});' title='Confidence: {probability}%'>{html.escape(token)}</span>"
-        
-        # Update position and remaining text
-        current_position += token_length
-        remaining_text = remaining_text[token_length:]
-    
-    # Add any remaining text
-    if remaining_text:
-        processed_text += html.escape(remaining_text)
-    
-    html_output += processed_text
-    html_output += "</div>"
-    
-    # Add CSS for better readability
-    html_output += """
-    <style>
-    .confidence-text {
-        font-family: sans-serif;
-        line-height: 1.5;
-        white-space: pre-wrap;
-    }
-    .confidence-text span {
-        cursor: pointer;
-    }
-    </style>
+        parts.append(f"<span style='color: {color};' title='Confidence: {probability}%'>{token_text.translate(_HTML_ESCAPE_TABLE)}</span>")
+        current_position = end
+
+    # Add any text not covered by the tokens
+    if current_position < len(text):
+        parts.append(text[current_position:].translate(_HTML_ESCAPE_TABLE))
+
+    return "".join(parts)
+
+
+def wrap_confidence_html(spans: str) -> str:
     """
-    
-    return html_output
+    Wrap confidence spans in a styled container
+
+    The container is styled by CONFIDENCE_CSS, which the app loads once per
+    page rather than sending with every update.
+
+    Args:
+        spans: HTML spans from format_confidence_spans
+
+    Returns:
+        str: HTML formatted text with color-coded confidence scores
+    """
+    return "<div class='confidence-text'>" + spans + "</div>"
+
+
+def get_confidence_css() -> str:
+    """
+    Get the CSS styling confidence-scored transcriptions
+
+    Returns:
+        str: CSS for the container built by wrap_confidence_html
+    """
+    return CONFIDENCE_CSS
 
 
 def format_confidence_scores_markdown(text: str, logprobs: List) -> str:
@@ -226,17 +408,13 @@ def format_confidence_scores_markdown(text: str, logprobs: List) -> str:
     
     low_confidence_tokens = []
     
-    for lp in logprobs:
-        # Get the token and its probability
-        token = lp.token if hasattr(lp, 'token') else lp['token']
-        log_prob = lp.logprob if hasattr(lp, 'logprob') else lp['logprob']
-        
-        # Convert log probability to probability (0-100%)
-        probability = np.round(np.exp(log_prob) * 100, 2)
-        
-        # Track low confidence tokens (less than 50% confidence)
-        if probability < 50 and token.strip():
-            low_confidence_tokens.append((token, probability))
+    # Track low confidence tokens (less than 50% confidence); most tokens are
+    # confident, so only the few below the threshold are visited
+    tokens, probabilities = _token_probabilities(logprobs)
+    for i in (probabilities < 50).nonzero()[0].tolist():
+        token = tokens[i]
+        if token.strip():
+            low_confidence_tokens.append((token, probabilities[i].item()))
     
     # Return the text with a note about low confidence tokens
     if low_confidence_tokens:
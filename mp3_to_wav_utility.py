@@ -1,7 +1,73 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import os
-from pydub import AudioSegment
+import shutil
+import stat
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# WAV codec written by ffmpeg for each supported bit depth
+FFMPEG_PCM_CODECS = {8: "pcm_u8", 16: "pcm_s16le", 24: "pcm_s24le", 32: "pcm_s32le"}
+
+# PyAV sample format and soundfile subtype for each bit depth PyAV can write
+PYAV_PCM_FORMATS = {16: ("s16", "PCM_16"), 24: ("s32", "PCM_24"), 32: ("s32", "PCM_32")}
+
+@functools.lru_cache(maxsize=None)
+def find_ffmpeg():
+    """
+    Locate the ffmpeg executable once, rather than searching PATH for every file
+    
+    Returns:
+        str: Path to ffmpeg, or None if it is not installed
+    """
+    return shutil.which("ffmpeg")
+
+def convert_with_pyav(input_file, output_file, sample_rate=44100, channels=2, bits=16):
+    """
+    Convert an audio file to WAV with PyAV, decoding and writing frame by frame
+    
+    Only one decoded frame is held in memory at a time, however long the file.
+    
+    Args:
+        input_file (str): Path to the input audio file
+        output_file (str): Path to save the output WAV file
+        sample_rate (int, optional): Sample rate for the output WAV file. Defaults to 44100 Hz.
+        channels (int, optional): Number of audio channels (1 or 2). Defaults to 2 (stereo).
+        bits (int, optional): Bit depth (16, 24 or 32). Defaults to 16 bits.
+    
+    Returns:
+        str: Path to the created WAV file
+    """
+    import av
+    import soundfile as sf
+    
+    sample_format, subtype = PYAV_PCM_FORMATS[bits]
+    with av.open(input_file) as container:
+        stream = container.streams.audio[0]
+        # Like the other paths, the source rate and channels are kept by default
+        # (sources with more channels are downmixed to stereo)
+        out_rate = sample_rate if sample_rate != 44100 else stream.rate
+        out_channels = channels if channels != 2 else min(stream.channels, 2)
+        resampler = av.AudioResampler(
+            format=sample_format,
+            layout="mono" if out_channels == 1 else "stereo",
+            rate=out_rate,
+        )
+        
+        with sf.SoundFile(output_file, mode="w", samplerate=out_rate,
+                          channels=out_channels, subtype=subtype) as out:
+            def write_frames(frames):
+                for frame in frames:
+                    # Packed formats come back as one interleaved row
+                    out.write(frame.to_ndarray().reshape(-1, out_channels))
+            
+            for frame in container.decode(stream):
+                write_frames(resampler.resample(frame))
+            # Flush samples still buffered in the resampler
+            write_frames(resampler.resample(None))
+    
+    return output_file
 
 def convert_mp3_to_wav(input_file, output_file=None, sample_rate=44100, channels=2, bits=16):
     """
@@ -18,13 +84,44 @@ def convert_mp3_to_wav(input_file, output_file=None, sample_rate=44100, channels
     Returns:
         str: Path to the created WAV file
     """
-    if not os.path.exists(input_file):
-        raise FileNotFoundError(f"Input file not found: {input_file}")
+    # One stat call checks both that the input exists and that it is a file
+    try:
+        input_stat = os.stat(input_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Input file not found: {input_file}") from None
+    if not stat.S_ISREG(input_stat.st_mode):
+        raise ValueError(f"Input path is not a file: {input_file}")
     
     # Generate output filename if not provided
     if output_file is None:
         output_file = os.path.splitext(input_file)[0] + ".wav"
     
+    # Decode and re-encode with a single ffmpeg process when it's on the PATH
+    ffmpeg = find_ffmpeg()
+    if ffmpeg and bits in FFMPEG_PCM_CODECS:
+        cmd = [ffmpeg, "-y", "-v", "error", "-i", input_file, "-vn"]
+        # Like the pydub path, the source rate and channels are kept by default
+        if sample_rate != 44100:
+            cmd += ["-ar", str(sample_rate)]
+        if channels != 2:
+            cmd += ["-ac", str(channels)]
+        cmd += ["-acodec", FFMPEG_PCM_CODECS[bits], output_file]
+        
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()}")
+        return output_file
+    
+    # Without the ffmpeg CLI, stream through PyAV's bundled ffmpeg if installed
+    if bits in PYAV_PCM_FORMATS and channels in (1, 2):
+        try:
+            return convert_with_pyav(input_file, output_file, sample_rate, channels, bits)
+        except ImportError:
+            pass
+    
+    # Last resort: pydub decodes the whole file into memory
+    from pydub import AudioSegment
+    
     # Load the MP3 file
     audio = AudioSegment.from_mp3(input_file)
     
@@ -41,7 +138,7 @@ def convert_mp3_to_wav(input_file, output_file=None, sample_rate=44100, channels
     
     return output_file
 
-def process_directory(input_dir, output_dir=None, sample_rate=44100, channels=2, bits=16):
+def process_directory(input_dir, output_dir=None, sample_rate=44100, channels=2, bits=16, max_workers=None):
     """
     Process all MP3 files in a directory and convert them to WAV format
     
@@ -52,6 +149,8 @@ def process_directory(input_dir, output_dir=None, sample_rate=44100, channels=2,
         sample_rate (int, optional): Sample rate for the output WAV files. Defaults to 44100 Hz.
         channels (int, optional): Number of audio channels. Defaults to 2 (stereo).
         bits (int, optional): Bit depth. Defaults to 16 bits.
+        max_workers (int, optional): Number of files converted in parallel. Defaults to
+                                     the number of CPUs.
     
     Returns:
         list: Paths to the created WAV files
@@ -69,36 +168,50 @@ def process_directory(input_dir, output_dir=None, sample_rate=44100, channels=2,
     converted_files = []
     errors = []
     
-    # Get all MP3 files in the directory
-    mp3_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.mp3')]
+    # Get all MP3 files in the directory; scandir returns the entry type
+    # without an extra stat per file
+    with os.scandir(input_dir) as entries:
+        mp3_files = [
+            (entry.name, entry.path)
+            for entry in entries
+            if entry.name.lower().endswith('.mp3') and entry.is_file()
+        ]
     
     if not mp3_files:
         print(f"No MP3 files found in directory: {input_dir}")
         return []
     
-    # Process each MP3 file
-    for mp3_file in mp3_files:
-        input_path = os.path.join(input_dir, mp3_file)
-        
-        if output_dir:
-            output_filename = os.path.splitext(mp3_file)[0] + ".wav"
-            output_path = os.path.join(output_dir, output_filename)
-        else:
-            output_path = None  # Let convert_mp3_to_wav determine the output path
-        
-        try:
-            wav_path = convert_mp3_to_wav(
+    # Convert the MP3 files in parallel; ffmpeg does the decoding in its own
+    # process, so threads are enough to keep every core busy
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {}
+        for mp3_file, input_path in mp3_files:
+            if output_dir:
+                output_filename = os.path.splitext(mp3_file)[0] + ".wav"
+                output_path = os.path.join(output_dir, output_filename)
+            else:
+                output_path = None  # Let convert_mp3_to_wav determine the output path
+            
+            future = executor.submit(
+                convert_mp3_to_wav,
                 input_path,
                 output_path,
                 sample_rate,
                 channels,
                 bits
             )
-            converted_files.append(wav_path)
-            print(f"Converted: {mp3_file} -> {os.path.basename(wav_path)}")
-        except Exception as e:
-            errors.append((mp3_file, str(e)))
-            print(f"Error converting {mp3_file}: {e}")
+            futures[future] = mp3_file
+        
+        # Report each file as soon as its conversion finishes
+        for future in as_completed(futures):
+            mp3_file = futures[future]
+            try:
+                wav_path = future.result()
+                converted_files.append(wav_path)
+                print(f"Converted: {mp3_file} -> {os.path.basename(wav_path)}")
+            except Exception as e:
+                errors.append((mp3_file, str(e)))
+                print(f"Error converting {mp3_file}: {e}")
     
     # Report summary
     print(f"\nConversion Summary:")
@@ -126,6 +239,8 @@ def main():
                         help='Number of audio channels (default: 2)')
     parser.add_argument('-b', '--bits', type=int, default=16,
                         help='Bit depth (default: 16 bits)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of files to convert in parallel (default: number of CPUs)')
     
     # Parse arguments
     args = parser.parse_args()
@@ -137,7 +252,8 @@ def main():
             args.output_dir,
             args.sample_rate,
             args.channels,
-            args.bits
+            args.bits,
+            args.jobs
         )
     except Exception as e:
         print(f"Error processing directory: {e}")